@@ -1,13 +1,36 @@
 #!/usr/bin/env python3
 """Hook that records chrome-devtools MCP tool calls to JSON Lines."""
 import json
+import os
 import pathlib
 import sys
 from datetime import datetime, timezone
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 OUTPUT_PATH = pathlib.Path(__file__).with_name("chrome_devtools_actions.jsonl")
 
 
+def encode_line(payload: Any) -> bytes:
+    """Serialize one JSONL record (including the trailing newline) as bytes."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(payload) + "\n").encode("utf-8")
+
+
+def append_line(path: pathlib.Path, data: bytes) -> None:
+    # A single O_APPEND write keeps concurrent hook invocations from interleaving lines.
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
 def log_error(message: str) -> None:
     sys.stderr.write(f"chrome_devtools_hook: {message}\n")
 
@@ -24,9 +47,7 @@ def main() -> int:
     if tool_name.startswith("mcp__chrome-devtools"):
         payload.setdefault("logged_at", datetime.now(tz=timezone.utc).isoformat())
         try:
-            with OUTPUT_PATH.open("a", encoding="utf-8") as fh:
-                json.dump(payload, fh)
-                fh.write("\n")
+            append_line(OUTPUT_PATH, encode_line(payload))
         except Exception as exc:  # noqa: BLE001
             log_error(f"failed to append payload: {exc}")
             return 1
@@ -14,6 +14,10 @@ from pathlib import Path
 from typing import Any, Optional
 
 
+# Resolved once per process; referenced in lock metadata on every acquire.
+_HOSTNAME = os.uname().nodename
+
+
 @dataclass
 class CodexRunConfig:
     volume_root: Path
@@ -116,48 +120,66 @@ def _safe_remove_dir(path: Path) -> None:
         pass
 
 
+def _remove_lock(lock_path: Path) -> None:
+    # Older runners used a lock directory (with a nested meta.json); clean
+    # those up too so an upgrade does not wedge on a leftover dir.
+    if lock_path.is_dir():
+        _safe_remove_dir(lock_path)
+        return
+    try:
+        os.unlink(lock_path)
+    except Exception:
+        pass
+
+
 def _acquire_lock(volume_root: Path, *, key: str) -> Optional[Path]:
-    lock_dir = Path(os.getenv("PITCHAI_CODEX_LOCK_DIR", str(volume_root / "locks" / f"{key}.lock")))
+    lock_path = Path(os.getenv("PITCHAI_CODEX_LOCK_DIR", str(volume_root / "locks" / f"{key}.lock")))
     wait_s = int(os.getenv("PITCHAI_CODEX_LOCK_WAIT_S", "60"))
     stale_after_s = int(os.getenv("PITCHAI_CODEX_LOCK_STALE_AFTER_S", "3600"))
 
-    lock_dir.parent.mkdir(parents=True, exist_ok=True)
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
     deadline = time.time() + max(0, wait_s)
 
     while True:
         try:
-            lock_dir.mkdir(parents=False, exist_ok=False)
-            meta = {
-                "ts_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
-                "pid": os.getpid(),
-                "host": os.uname().nodename,
-                "key": key,
-            }
-            try:
-                (lock_dir / "meta.json").write_text(json.dumps(meta, indent=2) + "\n", encoding="utf-8")
-            except Exception:
-                pass
-            return lock_dir
+            # A single O_EXCL create is atomic and costs one round trip on
+            # Azure Files/CIFS (vs. mkdir + a nested meta.json write).
+            fd = os.open(str(lock_path), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
         except FileExistsError:
             try:
-                age_s = time.time() - lock_dir.stat().st_mtime
+                age_s = time.time() - os.stat(lock_path).st_mtime
             except Exception:
                 age_s = 0
             if age_s > stale_after_s:
-                print(f"[lock] Removing stale lock at {lock_dir} (age_s={int(age_s)})", file=sys.stderr)
-                _safe_remove_dir(lock_dir)
+                print(f"[lock] Removing stale lock at {lock_path} (age_s={int(age_s)})", file=sys.stderr)
+                _remove_lock(lock_path)
                 continue
 
             if time.time() >= deadline:
-                print(f"[lock] Could not acquire lock within {wait_s}s; exiting (lock={lock_dir})", file=sys.stderr)
+                print(f"[lock] Could not acquire lock within {wait_s}s; exiting (lock={lock_path})", file=sys.stderr)
                 return None
             time.sleep(2)
+            continue
+
+        meta = {
+            "ts_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "pid": os.getpid(),
+            "host": _HOSTNAME,
+            "key": key,
+        }
+        try:
+            os.write(fd, (json.dumps(meta, indent=2) + "\n").encode("utf-8"))
+        except Exception:
+            pass
+        finally:
+            os.close(fd)
+        return lock_path
 
 
-def _release_lock(lock_dir: Optional[Path]) -> None:
-    if lock_dir is None:
+def _release_lock(lock_path: Optional[Path]) -> None:
+    if lock_path is None:
         return
-    _safe_remove_dir(lock_dir)
+    _remove_lock(lock_path)
 
 
 def _sanitize_key(value: str) -> str:
@@ -554,8 +576,8 @@ def _prepare_git_repo(
 def main() -> int:
     cfg = _resolve_config()
     key = _state_key_for_config(cfg.config_path)
-    lock_dir = _acquire_lock(cfg.volume_root, key=key)
-    if lock_dir is None:
+    lock_path = _acquire_lock(cfg.volume_root, key=key)
+    if lock_path is None:
         return 0
 
     try:
@@ -692,7 +714,7 @@ def main() -> int:
 
         return int(last_rc)
     finally:
-        _release_lock(lock_dir)
+        _release_lock(lock_path)
 
 
 if __name__ == "__main__":
@@ -1,28 +1,43 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import atexit
 import base64
 import hashlib
 import io
 import json
+import multiprocessing
 import os
+import random
 import re
 import ssl
 import sys
+import tempfile
+import threading
 import time
+import uuid
+import xml.etree.ElementTree as ET
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from email import policy
 from email.parser import BytesParser
 from email.utils import getaddresses
+from functools import lru_cache
 from html import unescape
-from typing import Any, Callable, Dict, List, Optional
-from urllib.parse import unquote, urlparse
+from typing import Any, BinaryIO, Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote, unquote, urlparse
 
 import msal
 import requests
 from pypdf import PdfReader
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover
+    orjson = None
 
 try:
     import PIL.Image  # type: ignore
@@ -34,16 +49,61 @@ try:
 except Exception:  # pragma: no cover
     pytesseract = None
 
+try:
+    import tesserocr  # type: ignore
+except Exception:  # pragma: no cover
+    tesserocr = None
+
+try:
+    import pypdfium2 as pdfium  # type: ignore
+except Exception:  # pragma: no cover
+    pdfium = None
+
 try:
     import yaml  # type: ignore
 except Exception:  # pragma: no cover
     yaml = None
 
 
+# Compiled once at import; several of these run per file / per attachment.
+# One pass for the HTML stripper: script/style blocks, <br>, </p>, any other tag.
+_RE_HTML = re.compile(r"(?is)(<(script|style)\b.*?>.*?</\2\s*>)|(<br\s*/?>|</p\s*>)|(<[^>]+>)")
+_RE_TAG = re.compile(r"<[^>]+>")
+_RE_WS = re.compile(r"[ \t\r\f\v]+")
+_RE_NL_WS = re.compile(r"\n\s+")
+_RE_OOXML_T = re.compile(r"<(?:a:t|w:t|t)(?:\s[^>]*)?>(.*?)</(?:a:t|w:t|t)>", re.DOTALL)
+_RE_SAFE_NAME = re.compile(r"[^A-Za-z0-9._-]+")
+_RE_PROJECT_CODE = re.compile(r"[A-Z0-9][A-Z0-9_-]{0,31}")
+_RE_DOMAIN_LABEL = re.compile(r"[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?")
+_RE_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+_RE_SPACES = re.compile(r"\s+")
+_RE_UNKNOWN_FIELD = [
+    re.compile(r"The property '([^']+)' does not exist on type"),
+    re.compile(r"Property '([^']+)' does not exist on type"),
+    re.compile(r"Field or property '([^']+)' does not exist"),
+    re.compile(r"Cannot find field '([^']+)'"),
+]
+
+
+def _json_loads(data: Union[str, bytes]) -> Any:
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can
+    # keep catching the stdlib exception.
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps_bytes(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
 def _now_utc_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+@lru_cache(maxsize=4096)
 def _odata_quote(value: str) -> str:
     return value.replace("'", "''")
 
@@ -78,7 +138,29 @@ def _acquire_token(app: msal.ConfidentialClientApplication, scope: str) -> str:
     return str(result["access_token"])
 
 
+def _new_http_session() -> requests.Session:
+    # Keep-alive pool so sequential `_api/web/...` calls reuse one TLS connection
+    # instead of paying a fresh TCP + TLS handshake per request. Retries are
+    # handled by `_request_with_retries`, so the adapter itself never retries.
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def _backoff_s(attempt: int) -> float:
+    # Full jitter: parallel workers that hit the same throttle spread their
+    # retries out instead of all coming back at the same instant.
+    return round(random.uniform(0, min(60, 2**attempt)), 2)
+
+
+def _past_deadline(deadline: Optional[float], wait_s: float) -> bool:
+    return deadline is not None and time.monotonic() + wait_s > deadline
+
+
 def _request_with_retries(
+    session: requests.Session,
     method: str,
     url: str,
     *,
@@ -88,31 +170,43 @@ def _request_with_retries(
     json_body: Optional[Dict[str, Any]] = None,
     timeout_s: int = 120,
     max_attempts: int = 6,
+    stream: bool = False,
+    deadline_s: Optional[float] = None,
 ) -> requests.Response:
+    # `deadline_s` bounds the total time spent across all attempts; a retry
+    # whose backoff would overrun it fails immediately instead.
+    deadline = time.monotonic() + deadline_s if deadline_s is not None else None
+    if json_body is not None:
+        # Serialize once up front (orjson when available) rather than letting
+        # requests re-encode the body on every retry attempt.
+        data = _json_dumps_bytes(json_body)
+        if not any(k.lower() == "content-type" for k in headers):
+            headers = {**headers, "Content-Type": "application/json"}
     for attempt in range(1, max_attempts + 1):
         try:
-            resp = requests.request(
+            resp = session.request(
                 method,
                 url,
                 headers=headers,
                 params=params,
                 data=data,
-                json=json_body,
                 timeout=timeout_s,
+                stream=stream,
             )
         except requests.RequestException as exc:
-            if attempt >= max_attempts:
+            wait_s = _backoff_s(attempt)
+            if attempt >= max_attempts or _past_deadline(deadline, wait_s):
                 raise
-            wait_s = min(60, 2**attempt)
             print(f"[net] {method} {url} failed ({exc}); retrying in {wait_s}s", file=sys.stderr)
             time.sleep(wait_s)
             continue
 
         if resp.status_code in (429, 500, 502, 503, 504):
-            if attempt >= max_attempts:
-                resp.raise_for_status()
             retry_after = resp.headers.get("Retry-After")
-            wait_s = int(retry_after) if retry_after and retry_after.isdigit() else min(60, 2**attempt)
+            wait_s = int(retry_after) if retry_after and retry_after.isdigit() else _backoff_s(attempt)
+            if attempt >= max_attempts or _past_deadline(deadline, wait_s):
+                resp.raise_for_status()
+            resp.close()
             print(f"[net] {method} {url} -> {resp.status_code}; retrying in {wait_s}s", file=sys.stderr)
             time.sleep(wait_s)
             continue
@@ -123,13 +217,105 @@ def _request_with_retries(
     raise RuntimeError("unreachable")
 
 
+# Ask SharePoint to compress JSON listings explicitly. urllib3 decodes these
+# transparently; "br" is only advertised when a brotli decoder is installed.
+_ACCEPT_ENCODING = requests.utils.DEFAULT_ACCEPT_ENCODING
+
+# SharePoint rejects $batch requests with more than 100 operations.
+_BATCH_MAX_OPS = 100
+_RE_BATCH_STATUS = re.compile(r"^HTTP/1\.[01] (\d{3})[^\r\n]*", re.MULTILINE)
+_RE_BLANK_LINE = re.compile(r"\r?\n\r?\n")
+_RE_BOUNDARY_LINE = re.compile(r"(?m)^--")
+
+
+@dataclass(frozen=True)
+class BatchPartResponse:
+    status: int
+    body: str
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+
+def _build_batch_body(ops: List[Dict[str, Any]], boundary: str) -> bytes:
+    # OData $batch (multipart/mixed). Reads go straight into the batch; every
+    # write gets its own changeset so one rejected update does not take the
+    # others down with it.
+    lines: List[str] = []
+    for op in ops:
+        method = str(op["method"])
+        request_lines = [f"{method} {op['url']} HTTP/1.1"]
+        request_lines.extend(f"{k}: {v}" for k, v in (op.get("headers") or {}).items())
+        request_lines.extend(["", op.get("body") or ""])
+        if method == "GET":
+            lines.extend([f"--{boundary}", "Content-Type: application/http", "Content-Transfer-Encoding: binary", ""])
+            lines.extend(request_lines)
+            continue
+        changeset = f"changeset_{uuid.uuid4()}"
+        lines.extend(
+            [
+                f"--{boundary}",
+                f'Content-Type: multipart/mixed; boundary="{changeset}"',
+                "Content-Transfer-Encoding: binary",
+                "",
+                f"--{changeset}",
+                "Content-Type: application/http",
+                "Content-Transfer-Encoding: binary",
+                "",
+            ]
+        )
+        lines.extend(request_lines)
+        lines.extend([f"--{changeset}--", ""])
+    lines.extend([f"--{boundary}--", ""])
+    return "\r\n".join(lines).encode("utf-8")
+
+
+def _parse_batch_response(text: str) -> List[BatchPartResponse]:
+    # Each sub-response is an embedded "HTTP/1.1 <status>" message, in request
+    # order; its body runs until the next multipart boundary line.
+    matches = list(_RE_BATCH_STATUS.finditer(text))
+    out: List[BatchPartResponse] = []
+    for i, m in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        # Segment starts at the status line's own line break, so the first blank
+        # line found is the end of the headers (even when there are none).
+        segment = text[m.end() : end]
+        pieces = _RE_BLANK_LINE.split(segment, maxsplit=1)
+        body = pieces[1] if len(pieces) > 1 else ""
+        body = _RE_BOUNDARY_LINE.split(body, maxsplit=1)[0]
+        out.append(BatchPartResponse(status=int(m.group(1)), body=body.strip()))
+    return out
+
+
 class SharePointRestClient:
-    def __init__(self, site_url: str, token: str, *, token_provider: Callable[[], str] | None = None) -> None:
+    def __init__(
+        self,
+        site_url: str,
+        token: str,
+        *,
+        token_provider: Callable[[], str] | None = None,
+        retry_deadline_s: Optional[float] = None,
+    ) -> None:
         self._site_url = site_url.rstrip("/")
+        # Default total retry budget per request (None = bounded by attempts only).
+        self._retry_deadline_s = retry_deadline_s
         self._token = token
         self._token_provider = token_provider
         self._digest: Optional[str] = None
         self._digest_acquired_at: float = 0.0
+        self._session = _new_http_session()
+        # Server-relative folder URLs verified/created by this client.
+        self._known_folders: set[str] = set()
+
+    def __enter__(self) -> "SharePointRestClient":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._session.close()
 
     @property
     def site_url(self) -> str:
@@ -139,6 +325,7 @@ class SharePointRestClient:
         base = {
             "Authorization": f"Bearer {self._token}",
             "Accept": "application/json;odata=nometadata",
+            "Accept-Encoding": _ACCEPT_ENCODING,
         }
         if extra:
             base.update(extra)
@@ -158,8 +345,8 @@ class SharePointRestClient:
         if self._digest and (time.time() - self._digest_acquired_at) < (25 * 60):
             return self._digest
         url = f"{self._site_url}/_api/contextinfo"
-        resp = _request_with_retries("POST", url, headers=self._headers({"Content-Length": "0"}))
-        data = resp.json()
+        resp = _request_with_retries(self._session, "POST", url, headers=self._headers({"Content-Length": "0"}))
+        data = _json_loads(resp.content)
         digest = None
         if isinstance(data, dict):
             digest = data.get("FormDigestValue")
@@ -184,13 +371,18 @@ class SharePointRestClient:
         json_body: Optional[Dict[str, Any]] = None,
         timeout_s: int = 120,
         max_attempts: int = 6,
+        stream: bool = False,
+        deadline_s: Optional[float] = None,
     ) -> requests.Response:
+        if deadline_s is None:
+            deadline_s = self._retry_deadline_s
         refreshed_token = False
         retried_digest = False
         while True:
             headers = self._headers(extra_headers)
             try:
                 return _request_with_retries(
+                    self._session,
                     method,
                     url,
                     headers=headers,
@@ -199,6 +391,8 @@ class SharePointRestClient:
                     json_body=json_body,
                     timeout_s=timeout_s,
                     max_attempts=max_attempts,
+                    stream=stream,
+                    deadline_s=deadline_s,
                 )
             except requests.HTTPError as exc:
                 status = exc.response.status_code if exc.response is not None else None
@@ -219,7 +413,7 @@ class SharePointRestClient:
             "?$select=RootFolder/ServerRelativeUrl&$expand=RootFolder"
         )
         resp = self._request("GET", url)
-        data = resp.json()
+        data = _json_loads(resp.content)
         root = data.get("RootFolder", {}).get("ServerRelativeUrl")
         if not root:
             raise RuntimeError(f"Could not resolve RootFolder.ServerRelativeUrl for library '{library_title}'")
@@ -230,9 +424,13 @@ class SharePointRestClient:
         if not folder.startswith("/"):
             folder = "/" + folder
         parts = [p for p in folder.split("/") if p]
+        if folder in self._known_folders:
+            return
         prefix = ""
         for part in parts:
             prefix += "/" + part
+            if prefix in self._known_folders:
+                continue
             try:
                 self._ensure_folder(prefix)
             except requests.HTTPError as exc:
@@ -240,13 +438,14 @@ class SharePointRestClient:
                 if status == 400:
                     continue
                 raise
+            self._known_folders.add(prefix)
 
     def _ensure_folder(self, server_relative_url: str) -> None:
         folder = server_relative_url.rstrip("/")
         get_url = f"{self._site_url}/_api/web/GetFolderByServerRelativeUrl('{_odata_quote(folder)}')?$select=Exists"
         try:
             resp = self._request("GET", get_url, max_attempts=2)
-            data = resp.json()
+            data = _json_loads(resp.content)
             if isinstance(data, dict) and data.get("Exists") is True:
                 return
         except requests.HTTPError as exc:
@@ -275,7 +474,7 @@ class SharePointRestClient:
             "$top": str(top),
         }
         resp = self._request("GET", url, params=params, timeout_s=300)
-        data = resp.json()
+        data = _json_loads(resp.content)
         value = data.get("value")
         if not isinstance(value, list):
             return []
@@ -287,6 +486,25 @@ class SharePointRestClient:
         resp = self._request("GET", url, timeout_s=300)
         return resp.content
 
+    def download_file_to(self, file_ref: str, dest: BinaryIO, *, chunk_size: int = 1 << 20) -> Tuple[int, str]:
+        """Stream a file into `dest`; returns (size_bytes, sha256_hex).
+
+        The body is never held in memory as a whole and is hashed in the same
+        pass as it is written.
+        """
+        ref = file_ref.rstrip("/")
+        url = f"{self._site_url}/_api/web/GetFileByServerRelativeUrl('{_odata_quote(ref)}')/$value"
+        digest = hashlib.sha256()
+        size = 0
+        with self._request("GET", url, timeout_s=300, stream=True) as resp:
+            for chunk in resp.iter_content(chunk_size=chunk_size):
+                if not chunk:
+                    continue
+                digest.update(chunk)
+                dest.write(chunk)
+                size += len(chunk)
+        return size, digest.hexdigest()
+
     def file_exists(self, file_ref: str) -> bool:
         ref = file_ref.rstrip("/")
         url = f"{self._site_url}/_api/web/GetFileByServerRelativeUrl('{_odata_quote(ref)}')?$select=Exists"
@@ -297,9 +515,40 @@ class SharePointRestClient:
             if status == 404:
                 return False
             raise
-        data = resp.json()
+        data = _json_loads(resp.content)
         return bool(isinstance(data, dict) and data.get("Exists") is True)
 
+    def files_exist(self, folder_ref: str, names: List[str], *, chunk_size: int = 50) -> set[str]:
+        """Return the subset of `names` present in `folder_ref`.
+
+        One filtered listing per `chunk_size` names (kept small for URL length
+        limits) instead of one Exists lookup per file. Prefer file_exists() for
+        single-shot checks. SharePoint's `Name eq` match ignores case, so this
+        does too, and it returns the names as the caller spelled them.
+        """
+        folder = folder_ref.rstrip("/")
+        url = f"{self._site_url}/_api/web/GetFolderByServerRelativeUrl('{_odata_quote(folder)}')/Files"
+        wanted = list(dict.fromkeys(n for n in names if n))
+        found_lower: set[str] = set()
+        for start in range(0, len(wanted), chunk_size):
+            chunk = wanted[start : start + chunk_size]
+            params = {
+                "$select": "Name",
+                "$filter": " or ".join(f"Name eq '{_odata_quote(name)}'" for name in chunk),
+                "$top": str(len(chunk)),
+            }
+            try:
+                resp = self._request("GET", url, params=params, timeout_s=120, max_attempts=2)
+            except requests.HTTPError as exc:
+                status = exc.response.status_code if exc.response is not None else None
+                if status == 404:
+                    return set()
+                raise
+            value = _json_loads(resp.content).get("value")
+            if isinstance(value, list):
+                found_lower.update(str(v.get("Name")).lower() for v in value if isinstance(v, dict) and v.get("Name"))
+        return {name for name in wanted if name.lower() in found_lower}
+
     def move_file(self, source_file_ref: str, dest_file_ref: str, *, keep_both: bool) -> None:
         src = source_file_ref.rstrip("/")
         dst_raw = dest_file_ref.strip()
@@ -409,12 +658,79 @@ class SharePointRestClient:
         ref = file_ref.rstrip("/")
         url = f"{self._site_url}/_api/web/GetFileByServerRelativeUrl('{_odata_quote(ref)}')/ListItemAllFields?$select=Id"
         resp = self._request("GET", url, timeout_s=120)
-        data = resp.json()
+        data = _json_loads(resp.content)
         item_id = data.get("Id")
         if not isinstance(item_id, int):
             raise RuntimeError(f"Could not resolve list item Id for file: {ref}")
         return item_id
 
+    def _batch(self, ops: List[Dict[str, Any]]) -> List[BatchPartResponse]:
+        out: List[BatchPartResponse] = []
+        for start in range(0, len(ops), _BATCH_MAX_OPS):
+            chunk = ops[start : start + _BATCH_MAX_OPS]
+            boundary = f"batch_{uuid.uuid4()}"
+            resp = self._request(
+                "POST",
+                f"{self._site_url}/_api/$batch",
+                extra_headers={
+                    "Content-Type": f"multipart/mixed; boundary={boundary}",
+                    "X-RequestDigest": self._ensure_digest(),
+                },
+                data=_build_batch_body(chunk, boundary),
+                timeout_s=300,
+            )
+            parts = _parse_batch_response(resp.text)
+            if len(parts) != len(chunk):
+                raise RuntimeError(f"$batch returned {len(parts)} responses for {len(chunk)} requests")
+            out.extend(parts)
+        return out
+
+    def _batch_url(self, path: str) -> str:
+        # Sub-requests are raw HTTP request lines, so spaces etc. must be escaped here.
+        return quote(f"{self._site_url}{path}", safe=":/?&=$'(),@")
+
+    def batch_get_list_item_ids(self, file_refs: List[str]) -> Dict[str, int]:
+        """Resolve list item ids for many files in one $batch round trip per 100."""
+        refs = [r.rstrip("/") for r in file_refs]
+        ops = [
+            {
+                "method": "GET",
+                "url": self._batch_url(f"/_api/web/GetFileByServerRelativeUrl('{_odata_quote(ref)}')/ListItemAllFields?$select=Id"),
+                "headers": {"Accept": "application/json;odata=nometadata"},
+            }
+            for ref in refs
+        ]
+        out: Dict[str, int] = {}
+        for ref, part in zip(refs, self._batch(ops)):
+            if not part.ok:
+                continue
+            try:
+                item_id = _json_loads(part.body).get("Id")
+            except Exception:
+                continue
+            if isinstance(item_id, int):
+                out[ref] = item_id
+        return out
+
+    def batch_update_items(self, library_title: str, updates: List[Tuple[int, Dict[str, Any]]]) -> List[BatchPartResponse]:
+        """MERGE fields into many list items via $batch; one response per update, in order."""
+        items_path = f"/_api/web/lists/GetByTitle('{_odata_quote(library_title)}')/items"
+        ops = [
+            {
+                "method": "POST",
+                "url": self._batch_url(f"{items_path}({item_id})"),
+                "headers": {
+                    "Content-Type": "application/json;odata=nometadata",
+                    "Accept": "application/json;odata=nometadata",
+                    "IF-MATCH": "*",
+                    "X-HTTP-Method": "MERGE",
+                },
+                "body": _json_dumps_bytes(fields).decode("utf-8"),
+            }
+            for item_id, fields in updates
+        ]
+        return self._batch(ops)
+
     def update_list_item_fields(self, library_title: str, item_id: int, fields: Dict[str, Any]) -> None:
         url = f"{self._site_url}/_api/web/lists/GetByTitle('{_odata_quote(library_title)}')/items({item_id})"
         self._request(
@@ -431,13 +747,14 @@ class SharePointRestClient:
         )
 
 
+def _html_tag_replacement(m: re.Match[str]) -> str:
+    return "\n" if m.group(3) else " "
+
+
 def _strip_html_to_text(html: str) -> str:
-    h = re.sub(r"(?is)<(script|style).*?>.*?</\\1>", " ", html)
-    h = re.sub(r"(?is)<br\\s*/?>", "\n", h)
-    h = re.sub(r"(?is)</p\\s*>", "\n", h)
-    h = re.sub(r"(?is)<[^>]+>", " ", h)
-    h = re.sub(r"[ \\t\\r\\f\\v]+", " ", h)
-    h = re.sub(r"\\n\\s+", "\n", h)
+    h = _RE_HTML.sub(_html_tag_replacement, html)
+    h = _RE_WS.sub(" ", h)
+    h = _RE_NL_WS.sub("\n", h)
     return h.strip()
 
 
@@ -483,109 +800,315 @@ def _safe_text(s: str, *, max_chars: int) -> str:
         return s
     return s[: max_chars - 3] + "..."
 
+@lru_cache(maxsize=1024)
 def _safe_filename(name: str) -> str:
     # Prevent path traversal and keep filenames predictable when writing locally.
     base = name.rsplit("/", 1)[-1].rsplit("\\", 1)[-1]
     base = base.strip() or "file"
-    base = re.sub(r"[^A-Za-z0-9._-]+", "_", base)
+    base = _RE_SAFE_NAME.sub("_", base)
     return base[:180] or "file"
 
 
-def _extract_ascii_strings(data: bytes, *, min_len: int = 6, max_total: int = 12000) -> str:
-    out: List[str] = []
-    buf: List[int] = []
-
-    def flush() -> None:
-        nonlocal buf
-        if len(buf) >= min_len:
-            out.append(bytes(buf).decode("ascii", errors="ignore"))
-        buf = []
-
-    for b in data:
-        if 32 <= b <= 126:
-            buf.append(b)
-            if len(buf) >= 2048:
-                flush()
-        else:
-            flush()
-        if sum(len(s) for s in out) > max_total:
+# Maps control bytes (other than tab/LF/CR) and DEL to 0, everything else to 1.
+# Bytes >= 0x80 count as text so UTF-8 multi-byte sequences are not penalized.
+_TEXT_BYTE_TABLE = bytes(0 if (b < 32 and b not in (9, 10, 13)) or b == 127 else 1 for b in range(256))
+
+_ASCII_RUN_MIN_LEN = 6
+# Runs of printable ASCII, capped at 2048 bytes per match (long runs are split).
+_RE_ASCII_RUN = re.compile(rb"[\x20-\x7e]{%d,2048}" % _ASCII_RUN_MIN_LEN)
+
+
+def _extract_ascii_strings(data: bytes, *, min_len: int = _ASCII_RUN_MIN_LEN, max_total: int = 12000) -> str:
+    pattern = _RE_ASCII_RUN if min_len == _ASCII_RUN_MIN_LEN else re.compile(rb"[\x20-\x7e]{%d,2048}" % min_len)
+    # Accumulate raw bytes and decode once at the end instead of creating a str
+    # per match only to join and slice them.
+    buf = bytearray()
+    for m in pattern.finditer(data):
+        if buf:
+            buf.append(0x0A)
+        buf += m.group()
+        if len(buf) > max_total:
             break
-    flush()
-    return "\n".join(out)[:max_total].strip()
+    return buf[:max_total].decode("ascii").strip()
 
 
-def _zip_read_text(zip_bytes: bytes, member: str) -> str:
-    try:
-        with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
-            with zf.open(member) as fh:
-                return fh.read().decode("utf-8", errors="replace")
-    except Exception:
-        return ""
+# Extractors accept either the raw bytes or a seekable binary file (e.g. the
+# spooled temp file a download was streamed into).
+DocumentSource = Union[bytes, BinaryIO]
+
+
+def _source_stream(data: DocumentSource) -> BinaryIO:
+    if isinstance(data, (bytes, bytearray)):
+        return io.BytesIO(data)
+    data.seek(0)
+    return data
 
 
-def _zip_list_members(zip_bytes: bytes, *, prefix: str) -> List[str]:
+def _source_bytes(data: DocumentSource) -> bytes:
+    if isinstance(data, (bytes, bytearray)):
+        return bytes(data)
+    data.seek(0)
+    return data.read()
+
+
+def _open_zip(data: DocumentSource) -> zipfile.ZipFile:
+    # Open once per document: every ZipFile() re-parses the central directory.
+    return zipfile.ZipFile(_source_stream(data))
+
+
+def _zip_read_bytes(zf: zipfile.ZipFile, member: str) -> bytes:
     try:
-        with zipfile.ZipFile(io.BytesIO(zip_bytes)) as zf:
-            return [name for name in zf.namelist() if name.startswith(prefix)]
+        return zf.read(member)
     except Exception:
-        return []
+        return b""
+
 
+_OOXML_TEXT_TAGS = frozenset(
+    [
+        "t",
+        "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}t",
+        "{http://schemas.openxmlformats.org/drawingml/2006/main}t",
+        "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}t",
+    ]
+)
 
-def _extract_office_xml_text(xml_text: str) -> str:
+
+def _extract_office_xml_text_regex(xml_text: str) -> str:
     # Extract text nodes from OOXML (docx/pptx/xlsx) without full XML parsing.
     parts = []
-    for match in re.finditer(r"<(?:a:t|w:t|t)(?:\\s[^>]*)?>(.*?)</(?:a:t|w:t|t)>", xml_text, flags=re.DOTALL):
-        parts.append(unescape(re.sub(r"<[^>]+>", "", match.group(1))))
+    for match in _RE_OOXML_T.finditer(xml_text):
+        parts.append(unescape(_RE_TAG.sub("", match.group(1))))
     text = "\n".join(p.strip() for p in parts if p and p.strip())
     return text.strip()
 
 
-def _extract_text_from_docx(data: bytes) -> str:
-    xml = _zip_read_text(data, "word/document.xml")
+def _extract_office_xml_text(xml_bytes: bytes) -> str:
+    # Stream text nodes (<w:t>, <a:t>, <t>) out of OOXML with the C expat parser;
+    # elements are cleared as we go so large documents are never held as a tree.
+    parts: List[str] = []
+    try:
+        for _, elem in ET.iterparse(io.BytesIO(xml_bytes), events=("end",)):
+            if elem.tag in _OOXML_TEXT_TAGS:
+                text = (elem.text or "").strip()
+                if text:
+                    parts.append(text)
+            elem.clear()
+    except ET.ParseError:
+        return _extract_office_xml_text_regex(xml_bytes.decode("utf-8", errors="replace"))
+    return "\n".join(parts).strip()
+
+
+def _extract_text_from_docx(data: DocumentSource) -> str:
+    try:
+        with _open_zip(data) as zf:
+            xml = _zip_read_bytes(zf, "word/document.xml")
+    except Exception:
+        return ""
     if not xml:
         return ""
     return _extract_office_xml_text(xml)
 
 
-def _extract_text_from_pptx(data: bytes) -> str:
-    members = _zip_list_members(data, prefix="ppt/slides/slide")
-    if not members:
+# XML parsing is CPU-bound, so large decks fan slides out to worker processes.
+# Small decks stay in-process: worker startup would cost more than it saves.
+_XML_POOL_MIN_TOTAL_BYTES = 1_000_000
+_XML_POOL: Optional[ProcessPoolExecutor] = None
+_XML_POOL_LOCK = threading.Lock()
+
+
+def _xml_pool_workers() -> int:
+    return max(1, min(4, os.cpu_count() or 1))
+
+
+def _xml_pool() -> ProcessPoolExecutor:
+    global _XML_POOL
+    with _XML_POOL_LOCK:
+        if _XML_POOL is None:
+            # The pool is first created from extraction worker threads; forking a
+            # multithreaded process can copy locks held by other threads, so spawn.
+            _XML_POOL = ProcessPoolExecutor(
+                max_workers=_xml_pool_workers(), mp_context=multiprocessing.get_context("spawn")
+            )
+            atexit.register(_XML_POOL.shutdown, cancel_futures=True)
+        return _XML_POOL
+
+
+def _extract_office_xml_texts(xmls: List[bytes]) -> List[str]:
+    if len(xmls) > 1 and _xml_pool_workers() > 1 and sum(len(x) for x in xmls) >= _XML_POOL_MIN_TOTAL_BYTES:
+        try:
+            return list(_xml_pool().map(_extract_office_xml_text, xmls))
+        except Exception:
+            pass
+    return [_extract_office_xml_text(x) for x in xmls]
+
+
+def _extract_text_from_pptx(data: DocumentSource) -> str:
+    # Read all slide XML up front from a single ZipFile so workers only parse.
+    try:
+        with _open_zip(data) as zf:
+            members = sorted(name for name in zf.namelist() if name.startswith("ppt/slides/slide"))[:20]
+            xmls = [_zip_read_bytes(zf, member) for member in members]
+    except Exception:
         return ""
-    out: List[str] = []
-    for member in sorted(members)[:20]:
-        xml = _zip_read_text(data, member)
-        if xml:
-            out.append(_extract_office_xml_text(xml))
+    out = _extract_office_xml_texts([x for x in xmls if x])
     return "\n".join([t for t in out if t]).strip()
 
 
-def _extract_text_from_xlsx(data: bytes) -> str:
-    shared = _zip_read_text(data, "xl/sharedStrings.xml")
+def _extract_text_from_xlsx(data: DocumentSource) -> str:
+    try:
+        with _open_zip(data) as zf:
+            shared = _zip_read_bytes(zf, "xl/sharedStrings.xml")
+    except Exception:
+        return ""
     if shared:
         return _extract_office_xml_text(shared)
     return ""
 
 
-def _extract_text_from_pdf(data: bytes) -> str:
-    try:
-        reader = PdfReader(io.BytesIO(data))
-        out: List[str] = []
-        for page in reader.pages[:20]:
+# PDF pages whose digital text is shorter than this are OCR'd (PITCHAI_OCR=1).
+_PDF_OCR_MIN_CHARS = 50
+
+# tesserocr keeps one Tesseract engine alive for the process instead of
+# spawning a `tesseract` subprocess per image like pytesseract does. The API
+# object is not thread-safe, so calls are serialized.
+_TESS_LOCK = threading.Lock()
+_TESS_API: Any = None
+_TESS_API_FAILED = False
+
+
+def _ocr_enabled() -> bool:
+    return (os.getenv("PITCHAI_OCR") or "").strip() == "1"
+
+
+def _tesseract_api() -> Any:
+    global _TESS_API, _TESS_API_FAILED
+    if _TESS_API is None and not _TESS_API_FAILED and tesserocr is not None:
+        try:
+            _TESS_API = tesserocr.PyTessBaseAPI(lang="eng")
+        except Exception:
+            _TESS_API_FAILED = True
+    return _TESS_API
+
+
+def _ocr_image(img: Any) -> str:
+    with _TESS_LOCK:
+        api = _tesseract_api()
+        if api is not None:
+            api.SetImage(img)
+            return str(api.GetUTF8Text()).strip()
+    if pytesseract is None:
+        return ""
+    return str(pytesseract.image_to_string(img)).strip()
+
+
+def _render_pdf_pages(pdf: Any, page_indexes: List[int]) -> Dict[int, Any]:
+    # Rasterize only the requested pages (those without usable digital text). The caller
+    # holds _PDFIUM_LOCK; the returned PIL images are OCR'd after it is released.
+    out: Dict[int, Any] = {}
+    for i in page_indexes:
+        try:
+            page = pdf[i]
+            try:
+                out[i] = page.render(scale=2).to_pil()
+            finally:
+                page.close()
+        except Exception:
+            continue
+    return out
+
+
+_PDF_MAX_PAGES = 20
+
+# PDFium is not thread-safe, not even across separate documents, and extraction runs on
+# the read_files/attachment worker threads. Every PDFium call happens under this lock.
+_PDFIUM_LOCK = threading.Lock()
+
+
+def _open_pdfium(data: DocumentSource) -> Any:
+    # PDFium reads a seekable file object on demand, so a download spooled to disk is
+    # never pulled into memory whole. The caller closes the document, not the file.
+    if isinstance(data, (bytes, bytearray)):
+        return pdfium.PdfDocument(bytes(data))
+    return pdfium.PdfDocument(_source_stream(data))
+
+
+def _pdf_pages_pdfium(pdf: Any) -> List[str]:
+    # PDFium (C++) text extraction; much faster than pypdf's pure-Python layout pass.
+    out: List[str] = []
+    for i in range(min(len(pdf), _PDF_MAX_PAGES)):
+        page = pdf[i]
+        try:
+            textpage = page.get_textpage()
+            try:
+                out.append(textpage.get_text_range() or "")
+            finally:
+                textpage.close()
+        except Exception:
+            out.append("")
+        finally:
+            page.close()
+    return out
+
+
+def _pdf_pages_pypdf(data: DocumentSource) -> List[str]:
+    reader = PdfReader(_source_stream(data))
+    out: List[str] = []
+    for page in reader.pages[:_PDF_MAX_PAGES]:
+        try:
+            out.append(page.extract_text() or "")
+        except Exception:
+            out.append("")
+    return out
+
+
+def _extract_text_from_pdf(data: DocumentSource) -> tuple[str, str]:
+    """Returns (text, source); source names the engine that produced the text."""
+    out: Optional[List[str]] = None
+    source = "pypdf"
+    ocr = _ocr_enabled() and (tesserocr is not None or pytesseract is not None)
+    images: Dict[int, Any] = {}
+    if pdfium is not None:
+        # One PDFium document serves both text extraction and OCR rasterization.
+        with _PDFIUM_LOCK:
             try:
-                out.append(page.extract_text() or "")
+                pdf = _open_pdfium(data)
             except Exception:
-                continue
-        return "\n".join(out).strip()
-    except Exception:
-        return ""
+                pdf = None
+            if pdf is not None:
+                try:
+                    out = _pdf_pages_pdfium(pdf)
+                    source = "pdfium"
+                    # Digital text first; OCR only the pages that came back (nearly) empty.
+                    if ocr:
+                        sparse = [i for i, text in enumerate(out) if len(text.strip()) < _PDF_OCR_MIN_CHARS]
+                        images = _render_pdf_pages(pdf, sparse)
+                except Exception:
+                    out = None
+                finally:
+                    pdf.close()
+    if out is None:
+        try:
+            out = _pdf_pages_pypdf(data)
+            source = "pypdf"
+        except Exception:
+            return "", source
+    # Tesseract runs outside the PDFium lock so other threads can parse PDFs meanwhile.
+    for i, img in images.items():
+        try:
+            text = _ocr_image(img)
+        except Exception:
+            continue
+        if len(text) > len(out[i].strip()):
+            out[i] = text
+    return "\n".join(out).strip(), source
 
 
-def _extract_text_from_image(data: bytes) -> str:
-    if PIL is None or pytesseract is None:
+def _extract_text_from_image(data: DocumentSource) -> str:
+    if PIL is None or (tesserocr is None and pytesseract is None):
         return ""
     try:
-        img = PIL.Image.open(io.BytesIO(data))
-        return str(pytesseract.image_to_string(img)).strip()
+        img = PIL.Image.open(_source_stream(data))
+        return _ocr_image(img)
     except Exception:
         return ""
 
@@ -597,14 +1120,54 @@ class ExtractedText:
     source: str
 
 
-def _extract_text(filename: str, data: bytes, *, depth: int = 0) -> ExtractedText:
+def _extract_workers() -> int:
+    return max(1, min(8, os.cpu_count() or 1))
+
+
+def _extract_attachments_parallel(
+    candidates: List[tuple[str, bytes]], *, depth: int, max_texts: int
+) -> List[tuple[str, ExtractedText]]:
+    # Extract attachments concurrently (PDF parsing / OCR / nested emails are
+    # independent), but keep the sequential semantics: results stay in message
+    # order and we stop at the first `max_texts` attachments that yield text.
+    # Work is submitted one window at a time so a mail with many attachments
+    # does not extract far past the cut-off.
+    out: List[tuple[str, ExtractedText]] = []
+    if not candidates:
+        return out
+    workers = min(_extract_workers(), len(candidates))
+    if workers <= 1:
+        for att_name, raw in candidates:
+            extracted = _extract_text(att_name, raw, depth=depth + 1)
+            if extracted.text.strip():
+                out.append((att_name, extracted))
+                if len(out) >= max_texts:
+                    break
+        return out
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for start in range(0, len(candidates), workers):
+            window = candidates[start : start + workers]
+            futures = [pool.submit(_extract_text, att_name, raw, depth=depth + 1) for att_name, raw in window]
+            for (att_name, _), fut in zip(window, futures):
+                extracted = fut.result()
+                if extracted.text.strip():
+                    out.append((att_name, extracted))
+                    if len(out) >= max_texts:
+                        return out
+    return out
+
+
+def _extract_text(filename: str, data: DocumentSource, *, depth: int = 0) -> ExtractedText:
     name_l = filename.lower()
     if depth >= 3:
-        return ExtractedText(file_type="binary", text=_extract_ascii_strings(data), source="max_depth_ascii_strings")
+        return ExtractedText(
+            file_type="binary", text=_extract_ascii_strings(_source_bytes(data)), source="max_depth_ascii_strings"
+        )
 
     if name_l.endswith(".eml"):
         try:
-            msg = BytesParser(policy=policy.default).parsebytes(data)
+            msg = BytesParser(policy=policy.default).parse(_source_stream(data))
         except Exception:
             return ExtractedText(file_type="eml", text="", source="eml_parse_failed")
         subject = str(msg.get("subject", "") or "").strip()
@@ -613,28 +1176,34 @@ def _extract_text(filename: str, data: bytes, *, depth: int = 0) -> ExtractedTex
         cc = str(msg.get("cc", "") or "").strip()
         body = _email_body_text(msg)
         attachment_names: List[str] = []
-        attachment_texts: List[str] = []
+        candidates: List[tuple[str, bytes]] = []
         for part in msg.walk():
             if part.get_content_disposition() != "attachment":
                 continue
             att_name = part.get_filename() or "attachment"
             raw = part.get_payload(decode=True) or b""
             attachment_names.append(f"{att_name} ({len(raw)} bytes)")
-            if raw and len(attachment_texts) < 5 and len(raw) <= 20_000_000:
-                extracted = _extract_text(att_name, raw, depth=depth + 1)
-                att_text = extracted.text.strip()
-                if att_text:
-                    attachment_texts.append(
-                        "\n".join(
-                            [
-                                f"attachment: {att_name}",
-                                f"attachment_file_type: {extracted.file_type}",
-                                f"attachment_extract_source: {extracted.source}",
-                                "",
-                                _safe_text(att_text, max_chars=4000),
-                            ]
-                        ).strip()
+            if raw and len(raw) <= 20_000_000:
+                candidates.append((att_name, raw))
+
+        attachment_texts: List[str] = []
+        for att_name, extracted in _extract_attachments_parallel(candidates, depth=depth, max_texts=5):
+            att_text = extracted.text.strip()
+            if len(att_text) > 4000:
+                att_text = att_text[:3997] + "..."
+            # Header lines are non-empty and att_text is already stripped, so the
+            # joined block needs no further strip() copy.
+            attachment_texts.append(
+                "\n".join(
+                    (
+                        "attachment: " + att_name,
+                        "attachment_file_type: " + extracted.file_type,
+                        "attachment_extract_source: " + extracted.source,
+                        "",
+                        att_text,
                     )
+                )
+            )
 
         parts: List[str] = [
             f"subject: {subject}",
@@ -666,13 +1235,16 @@ def _extract_text(filename: str, data: bytes, *, depth: int = 0) -> ExtractedTex
         return ExtractedText(file_type="xlsx", text=text, source="ooxml_excel")
 
     if name_l.endswith(".pdf"):
-        text = _extract_text_from_pdf(data)
-        return ExtractedText(file_type="pdf", text=text, source="pypdf")
+        text, source = _extract_text_from_pdf(data)
+        return ExtractedText(file_type="pdf", text=text, source=source)
 
     if any(name_l.endswith(ext) for ext in [".png", ".jpg", ".jpeg", ".tiff", ".bmp"]):
         text = _extract_text_from_image(data)
         return ExtractedText(file_type="image", text=text, source="tesseract" if text else "image_no_text")
 
+    # Remaining branches work on the raw bytes.
+    data = _source_bytes(data)
+
     if any(name_l.endswith(ext) for ext in [".txt", ".md", ".csv", ".json", ".xml", ".html", ".htm"]):
         try:
             decoded = data.decode("utf-8", errors="replace")
@@ -682,12 +1254,16 @@ def _extract_text(filename: str, data: bytes, *, depth: int = 0) -> ExtractedTex
             decoded = _strip_html_to_text(decoded)
         return ExtractedText(file_type="text", text=decoded.strip(), source="utf8_decode")
 
-    try:
-        decoded = data.decode("utf-8", errors="replace").strip()
-    except Exception:
-        decoded = ""
-    if decoded and sum(1 for ch in decoded[:2000] if ch.isprintable()) / max(1, len(decoded[:2000])) > 0.8:
-        return ExtractedText(file_type="text", text=decoded, source="utf8_guess")
+    # Classify the first 2000 raw bytes in C (translate + count) and only pay
+    # for the UTF-8 decode when the sample looks like text.
+    sample = data[:2000]
+    if sample and (len(sample) - sample.translate(_TEXT_BYTE_TABLE).count(0)) / len(sample) > 0.8:
+        try:
+            decoded = data.decode("utf-8", errors="replace").strip()
+        except Exception:
+            decoded = ""
+        if decoded:
+            return ExtractedText(file_type="text", text=decoded, source="utf8_guess")
 
     return ExtractedText(file_type="binary", text=_extract_ascii_strings(data), source="ascii_strings")
 
@@ -695,7 +1271,7 @@ def _extract_text(filename: str, data: bytes, *, depth: int = 0) -> ExtractedTex
 def _load_tool_args() -> Dict[str, Any]:
     raw = os.getenv("CODEX_TOOL_ARGS_JSON", "{}")
     try:
-        data = json.loads(raw)
+        data = _json_loads(raw)
     except json.JSONDecodeError as exc:
         raise RuntimeError(f"Invalid CODEX_TOOL_ARGS_JSON: {exc}") from exc
     if not isinstance(data, dict):
@@ -703,10 +1279,19 @@ def _load_tool_args() -> Dict[str, Any]:
     return data
 
 
-def _new_sharepoint_client() -> SharePointRestClient:
-    tenant_id = _require_env("PITCHAI_SP_TENANT_ID")
-    client_id = _require_env("PITCHAI_SP_CLIENT_ID")
-    site_url = _require_env("PITCHAI_SP_SITE_URL").rstrip("/")
+# One MSAL app / client per (tenant, client, site) for the life of the process:
+# PEM decoding, thumbprinting and app construction run once, and MSAL's own
+# in-memory token cache then makes acquire_token_for_client cheap.
+_MSAL_APP_CACHE: Dict[tuple[str, str], msal.ConfidentialClientApplication] = {}
+_SP_CLIENT_CACHE: Dict[tuple[str, str, str], SharePointRestClient] = {}
+_SP_CLIENT_CACHE_LOCK = threading.Lock()
+
+
+def _msal_app(tenant_id: str, client_id: str) -> msal.ConfidentialClientApplication:
+    key = (tenant_id, client_id)
+    app = _MSAL_APP_CACHE.get(key)
+    if app is not None:
+        return app
     private_key_pem = _b64decode_text(_require_env("PITCHAI_CERT_PRIVATE_KEY_B64"))
     public_cert_pem = _b64decode_text(_require_env("PITCHAI_CERT_PUBLIC_CERT_B64"))
 
@@ -717,11 +1302,34 @@ def _new_sharepoint_client() -> SharePointRestClient:
         authority=authority,
         client_credential={"private_key": private_key_pem, "thumbprint": thumbprint},
     )
+    _MSAL_APP_CACHE[key] = app
+    return app
 
-    host = urlparse(site_url).netloc
-    scope = f"https://{host}/.default"
-    token = _acquire_token(app, scope)
-    return SharePointRestClient(site_url, token, token_provider=lambda: _acquire_token(app, scope))
+
+def _new_sharepoint_client() -> SharePointRestClient:
+    tenant_id = _require_env("PITCHAI_SP_TENANT_ID")
+    client_id = _require_env("PITCHAI_SP_CLIENT_ID")
+    site_url = _require_env("PITCHAI_SP_SITE_URL").rstrip("/")
+
+    key = (tenant_id, client_id, site_url)
+    with _SP_CLIENT_CACHE_LOCK:
+        client = _SP_CLIENT_CACHE.get(key)
+        if client is not None:
+            return client
+
+        app = _msal_app(tenant_id, client_id)
+        host = urlparse(site_url).netloc
+        scope = f"https://{host}/.default"
+        token = _acquire_token(app, scope)
+        deadline_raw = _optional_env("PITCHAI_SP_RETRY_DEADLINE_S")
+        client = SharePointRestClient(
+            site_url,
+            token,
+            token_provider=lambda: _acquire_token(app, scope),
+            retry_deadline_s=float(deadline_raw) if deadline_raw and deadline_raw.isdigit() else None,
+        )
+        _SP_CLIENT_CACHE[key] = client
+        return client
 
 
 def _normalize_project_code(value: str) -> Optional[str]:
@@ -732,7 +1340,7 @@ def _normalize_project_code(value: str) -> Optional[str]:
     if project.startswith("PRJ-"):
         project = project[4:]
     project = project.strip()
-    if not re.fullmatch(r"[A-Z0-9][A-Z0-9_-]{0,31}", project):
+    if not _RE_PROJECT_CODE.fullmatch(project):
         return None
     if project == "ORTHOCENTER":
         return "AUTOPAR"
@@ -754,15 +1362,15 @@ def _normalize_domain(value: str) -> str:
 
 def _is_valid_domain_label(label: str) -> bool:
     # Be forgiving: allow single-label keys like "zlto" that match a domain label.
-    return bool(re.fullmatch(r"[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?", label))
+    return bool(_RE_DOMAIN_LABEL.fullmatch(label))
 
 
 def _normalize_name(value: str) -> str:
     text = value.strip().lower()
     if not text:
         return ""
-    text = re.sub(r"[^a-z0-9]+", " ", text)
-    return re.sub(r"\s+", " ", text).strip()
+    text = _RE_NON_ALNUM.sub(" ", text)
+    return _RE_SPACES.sub(" ", text).strip()
 
 
 def _parse_routing_mapping(config: Any) -> tuple[Dict[str, str], Dict[str, str], Dict[str, str], List[str]]:
@@ -1153,27 +1761,22 @@ def _op_list_inbox() -> Dict[str, Any]:
     return {"library": library, "library_root": root, "inbox": inbox, "count": len(out), "files": out, "ts": _now_utc_iso()}
 
 
-def _op_read_file() -> Dict[str, Any]:
-    args = _load_tool_args()
-    file_ref = args.get("file_ref")
-    if not isinstance(file_ref, str) or not file_ref.strip():
-        raise RuntimeError("Missing required parameter: file_ref")
-
-    max_chars = int(args.get("max_chars") or 15000)
-    sp = _new_sharepoint_client()
-    raw = sp.download_file_bytes(file_ref)
+def _read_file_to_disk(sp: SharePointRestClient, file_ref: str, *, max_chars: int) -> Dict[str, Any]:
     filename = file_ref.rstrip("/").rsplit("/", 1)[-1]
-    extracted = _extract_text(filename, raw)
+    # Small files stay in memory; large PDFs/attachments spill to disk instead of
+    # being buffered whole (matters when several reads run in parallel).
+    with tempfile.SpooledTemporaryFile(max_size=10_000_000) as tmp:
+        size_bytes, sha256 = sp.download_file_to(file_ref, tmp)
+        extracted = _extract_text(filename, tmp)
     text = extracted.text.strip()
     truncated = False
     if max_chars > 0 and len(text) > max_chars:
         text = _safe_text(text, max_chars=max_chars)
         truncated = True
-    sha256 = hashlib.sha256(raw).hexdigest()
     out_dir = os.getenv("PITCHAI_EXTRACTED_TEXT_DIR") or "/tmp/pitchai_sharepoint_extracted"
     os.makedirs(out_dir, exist_ok=True)
     call_id = os.getenv("CODEX_TOOL_CALL_ID") or f"call_{sha256[:12]}"
-    safe_call_id = re.sub(r"[^A-Za-z0-9._-]+", "_", call_id)[:80] or f"call_{sha256[:12]}"
+    safe_call_id = _RE_SAFE_NAME.sub("_", call_id)[:80] or f"call_{sha256[:12]}"
     safe_name = _safe_filename(filename)
     out_path = os.path.join(out_dir, f"{safe_call_id}_{safe_name}.txt")
     with open(out_path, "w", encoding="utf-8", errors="replace") as fh:
@@ -1184,7 +1787,7 @@ def _op_read_file() -> Dict[str, Any]:
         "file_type": extracted.file_type,
         "extract_source": extracted.source,
         "sha256": sha256,
-        "size_bytes": len(raw),
+        "size_bytes": size_bytes,
         "extracted_text_path": out_path,
         "text_char_count": len(text),
         "truncated": truncated,
@@ -1192,6 +1795,49 @@ def _op_read_file() -> Dict[str, Any]:
     }
 
 
+def _op_read_file() -> Dict[str, Any]:
+    args = _load_tool_args()
+    file_ref = args.get("file_ref")
+    if not isinstance(file_ref, str) or not file_ref.strip():
+        raise RuntimeError("Missing required parameter: file_ref")
+
+    max_chars = int(args.get("max_chars") or 15000)
+    sp = _new_sharepoint_client()
+    return _read_file_to_disk(sp, file_ref, max_chars=max_chars)
+
+
+def _op_read_files() -> Dict[str, Any]:
+    # Batch variant of read_file: downloads (network-bound) and extraction
+    # (PDF/OCR, CPU-bound) for independent files overlap on a bounded pool that
+    # shares the client's keep-alive connections.
+    args = _load_tool_args()
+    file_refs = args.get("file_refs")
+    if not isinstance(file_refs, list) or not file_refs:
+        raise RuntimeError("Missing required parameter: file_refs (array)")
+    refs = [str(r) for r in file_refs if isinstance(r, str) and r.strip()]
+    if not refs:
+        raise RuntimeError("Missing required parameter: file_refs (array)")
+
+    max_chars = int(args.get("max_chars") or 15000)
+    concurrency_raw = _optional_env("PITCHAI_SP_READ_CONCURRENCY")
+    concurrency = int(concurrency_raw) if concurrency_raw and concurrency_raw.isdigit() else 4
+    concurrency = max(1, min(concurrency, 16, len(refs)))
+
+    sp = _new_sharepoint_client()
+
+    def read_one(ref: str) -> Dict[str, Any]:
+        try:
+            return _read_file_to_disk(sp, ref, max_chars=max_chars)
+        except Exception as exc:
+            return {"file_ref": ref, "error": str(exc), "ts": _now_utc_iso()}
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(read_one, refs))
+
+    error_count = sum(1 for r in results if "error" in r)
+    return {"count": len(results), "error_count": error_count, "files": results, "ts": _now_utc_iso()}
+
+
 def _op_ensure_folder() -> Dict[str, Any]:
     args = _load_tool_args()
     folder_ref = args.get("folder_ref")
@@ -1216,83 +1862,138 @@ def _op_move_file() -> Dict[str, Any]:
     return {"src_ref": src, "dest_ref": dst, "keep_both": keep_both, "ok": True, "ts": _now_utc_iso()}
 
 
-def _op_update_fields() -> Dict[str, Any]:
-    args = _load_tool_args()
-    file_ref = args.get("file_ref")
-    fields = args.get("fields")
-    library = str(args.get("library") or _optional_env("PITCHAI_SP_LIBRARY") or "Documenten")
-    if not isinstance(file_ref, str) or not file_ref.strip():
-        raise RuntimeError("Missing required parameter: file_ref")
-    if not isinstance(fields, dict) or not fields:
-        raise RuntimeError("Missing required parameter: fields (object)")
+def _sp_error_message(text: str) -> str:
+    try:
+        data = _json_loads(text)
+    except Exception:
+        return (text or "").strip()
+    if not isinstance(data, dict):
+        return (text or "").strip()
+    error = data.get("error") or data.get("odata.error")
+    if isinstance(error, dict):
+        msg = error.get("message")
+        if isinstance(msg, dict):
+            value = msg.get("value")
+            if isinstance(value, str):
+                return value.strip()
+        if isinstance(msg, str):
+            return msg.strip()
+    return (text or "").strip()
+
+
+def _parse_unknown_field_name(message: str) -> Optional[str]:
+    for pat in _RE_UNKNOWN_FIELD:
+        m = pat.search(message)
+        if m:
+            return str(m.group(1))
+    return None
 
-    sp = _new_sharepoint_client()
-    item_id = sp.get_file_list_item_id(file_ref)
+
+def _update_fields_dropping_unknown(
+    sp: SharePointRestClient, library: str, item_id: int, fields: Dict[str, Any]
+) -> tuple[List[str], List[str]]:
+    # Retry the MERGE without any field SharePoint reports as unknown.
+    # Returns (updated_keys, dropped_keys); updated_keys is empty if every field was dropped.
     remaining = dict(fields)
     dropped: List[str] = []
-
-    def extract_error_message(resp: requests.Response) -> str:
-        try:
-            data = resp.json()
-        except Exception:
-            return (resp.text or "").strip()
-        if not isinstance(data, dict):
-            return (resp.text or "").strip()
-        error = data.get("error")
-        if isinstance(error, dict):
-            msg = error.get("message")
-            if isinstance(msg, dict):
-                value = msg.get("value")
-                if isinstance(value, str):
-                    return value.strip()
-            if isinstance(msg, str):
-                return msg.strip()
-        return (resp.text or "").strip()
-
-    def parse_unknown_field_name(message: str) -> Optional[str]:
-        patterns = [
-            r"The property '([^']+)' does not exist on type",
-            r"Property '([^']+)' does not exist on type",
-            r"Field or property '([^']+)' does not exist",
-            r"Cannot find field '([^']+)'",
-        ]
-        for pat in patterns:
-            m = re.search(pat, message)
-            if m:
-                return str(m.group(1))
-        return None
-
     while remaining:
         try:
             sp.update_list_item_fields(library, item_id, remaining)
-            return {
-                "library": library,
-                "file_ref": file_ref,
-                "item_id": item_id,
-                "updated_keys": sorted(remaining.keys()),
-                "dropped_keys": sorted(set(dropped)),
-                "ok": True,
-                "ts": _now_utc_iso(),
-            }
+            return sorted(remaining.keys()), sorted(set(dropped))
         except requests.HTTPError as exc:
             resp = exc.response
             if resp is None:
                 raise
-            message = extract_error_message(resp)
-            unknown = parse_unknown_field_name(message)
+            unknown = _parse_unknown_field_name(_sp_error_message(resp.text))
             if unknown and unknown in remaining:
                 dropped.append(unknown)
                 remaining.pop(unknown, None)
                 continue
             raise
+    return [], sorted(set(dropped))
+
+
+def _op_update_fields() -> Dict[str, Any]:
+    args = _load_tool_args()
+    file_ref = args.get("file_ref")
+    fields = args.get("fields")
+    library = str(args.get("library") or _optional_env("PITCHAI_SP_LIBRARY") or "Documenten")
+    if not isinstance(file_ref, str) or not file_ref.strip():
+        raise RuntimeError("Missing required parameter: file_ref")
+    if not isinstance(fields, dict) or not fields:
+        raise RuntimeError("Missing required parameter: fields (object)")
 
+    sp = _new_sharepoint_client()
+    item_id = sp.get_file_list_item_id(file_ref)
+    updated, dropped = _update_fields_dropping_unknown(sp, library, item_id, fields)
     return {
         "library": library,
         "file_ref": file_ref,
         "item_id": item_id,
-        "updated_keys": [],
-        "dropped_keys": sorted(set(dropped)),
-        "ok": False,
+        "updated_keys": updated,
+        "dropped_keys": dropped,
+        "ok": bool(updated),
+        "ts": _now_utc_iso(),
+    }
+
+
+def _op_update_fields_bulk() -> Dict[str, Any]:
+    # Item-id lookups and MERGEs for many files go out as $batch requests
+    # (100 operations each) instead of two round trips per file. Updates that
+    # SharePoint rejects for an unknown field fall back to the per-file path,
+    # which drops unknown fields and retries.
+    args = _load_tool_args()
+    fields_by_file_ref = args.get("fields_by_file_ref")
+    library = str(args.get("library") or _optional_env("PITCHAI_SP_LIBRARY") or "Documenten")
+    if not isinstance(fields_by_file_ref, dict) or not fields_by_file_ref:
+        raise RuntimeError("Missing required parameter: fields_by_file_ref (object)")
+    wanted: Dict[str, Dict[str, Any]] = {}
+    for ref, fields in fields_by_file_ref.items():
+        if isinstance(ref, str) and ref.strip() and isinstance(fields, dict) and fields:
+            wanted[ref.rstrip("/")] = fields
+    if not wanted:
+        raise RuntimeError("fields_by_file_ref has no valid {file_ref: fields} entries")
+
+    sp = _new_sharepoint_client()
+    item_ids = sp.batch_get_list_item_ids(list(wanted))
+
+    results: List[Dict[str, Any]] = []
+    pending: List[tuple[str, int]] = []
+    for ref in wanted:
+        item_id = item_ids.get(ref)
+        if item_id is None:
+            results.append({"file_ref": ref, "ok": False, "error": "could not resolve list item Id"})
+        else:
+            pending.append((ref, item_id))
+
+    responses = sp.batch_update_items(library, [(item_id, wanted[ref]) for ref, item_id in pending])
+    for (ref, item_id), part in zip(pending, responses):
+        fields = wanted[ref]
+        if part.ok:
+            results.append(
+                {"file_ref": ref, "item_id": item_id, "ok": True, "updated_keys": sorted(fields), "dropped_keys": []}
+            )
+            continue
+        message = _sp_error_message(part.body)
+        if _parse_unknown_field_name(message) is None:
+            results.append({"file_ref": ref, "item_id": item_id, "ok": False, "error": message or f"HTTP {part.status}"})
+            continue
+        try:
+            updated, dropped = _update_fields_dropping_unknown(sp, library, item_id, fields)
+        except Exception as exc:
+            results.append({"file_ref": ref, "item_id": item_id, "ok": False, "error": str(exc)})
+            continue
+        results.append(
+            {"file_ref": ref, "item_id": item_id, "ok": bool(updated), "updated_keys": updated, "dropped_keys": dropped}
+        )
+
+    error_count = sum(1 for r in results if not r.get("ok"))
+    return {
+        "library": library,
+        "count": len(results),
+        "error_count": error_count,
+        "results": results,
+        "ok": error_count == 0,
         "ts": _now_utc_iso(),
     }
 
@@ -1308,17 +2009,21 @@ def main() -> int:
         out = _op_route_eml_by_sender()
     elif op == "read_file":
         out = _op_read_file()
+    elif op == "read_files":
+        out = _op_read_files()
     elif op == "ensure_folder":
         out = _op_ensure_folder()
     elif op == "move_file":
         out = _op_move_file()
     elif op == "update_fields":
         out = _op_update_fields()
+    elif op == "update_fields_bulk":
+        out = _op_update_fields_bulk()
     else:
         raise RuntimeError(f"Unknown op: {op}")
 
-    sys.stdout.write(json.dumps(out, ensure_ascii=False))
-    sys.stdout.write("\n")
+    sys.stdout.buffer.write(_json_dumps_bytes(out) + b"\n")
+    sys.stdout.flush()
     return 0
 
 
@@ -1,19 +1,25 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import asyncio
+import base64
 import json
 import os
 import re
 import subprocess
 import sys
 import hashlib
+import hmac
+import string
+import threading
+import time
 from dataclasses import dataclass
-from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any, Optional
-from uuid import uuid4
 
-import requests
+import httpx
 from fastapi import FastAPI, Header, HTTPException, Request
 from fastapi.responses import PlainTextResponse
 
@@ -22,6 +28,26 @@ try:
 except Exception:  # noqa: BLE001
     DefaultAzureCredential = None  # type: ignore[misc,assignment]
 
+try:
+    import h2  # type: ignore  # noqa: F401  (enables HTTP/2 in httpx)
+except Exception:  # noqa: BLE001
+    h2 = None  # type: ignore[assignment]
+
+try:
+    import orjson  # type: ignore
+except Exception:  # noqa: BLE001
+    orjson = None  # type: ignore[assignment]
+
+
+# Shared keep-alive client for Telegram and Azure management calls. The handlers are async,
+# so outbound calls must not block the event loop. With h2 installed, the list + start calls
+# to management.azure.com multiplex over a single HTTP/2 connection.
+_HTTPX = httpx.AsyncClient(
+    http2=h2 is not None,
+    timeout=30,
+    limits=httpx.Limits(max_keepalive_connections=4),
+)
+
 
 @dataclass(frozen=True)
 class Settings:
@@ -66,39 +92,75 @@ class DispatchRequest:
     job_name: Optional[str]
 
 
+# The environment is read once, when the app module is imported by uvicorn.
+_ENV = MappingProxyType(dict(os.environ))
+
+_FILENAME_RE = re.compile(r"[^a-zA-Z0-9_.-]+")
+_FILENAME_SAFE_BYTES = string.ascii_letters.encode("ascii") + string.digits.encode("ascii") + b"_.-"
+_TS_FMT = "%Y-%m-%dT%H:%M:%SZ"
+# Azure Files share names and paths must be compatible with SMB/Windows rules
+# (e.g., ':' is not allowed). Use a compact ISO-like timestamp for filenames.
+_TS_COMPACT_FMT = "%Y%m%dT%H%M%SZ"
+
+
+def _env(name: str, default: str = "") -> str:
+    return _ENV.get(name, default)
+
+
+# Log secret hashes on auth failures only when explicitly debugging.
+_DEBUG_AUTH = _env("PITCHAI_DEBUG_AUTH").strip() == "1"
+
+
+def _secret_matches(got: Optional[str], expected: str) -> bool:
+    return hmac.compare_digest((got or "").encode("utf-8"), expected.encode("utf-8"))
+
+
+def _json_loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps_pretty_bytes(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
 def _require_env(name: str) -> str:
-    value = os.getenv(name, "").strip()
+    value = _env(name).strip()
     if not value:
         raise RuntimeError(f"Missing required environment variable: {name}")
     return value
 
 
 def _optional_env(name: str) -> Optional[str]:
-    value = os.getenv(name, "").strip()
+    value = _env(name).strip()
     return value or None
 
 
 def _now_utc() -> str:
-    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+    return time.strftime(_TS_FMT, time.gmtime())
 
 
 def _now_utc_compact() -> str:
-    # Azure Files share names and paths must be compatible with SMB/Windows rules
-    # (e.g., ':' is not allowed). Use a compact ISO-like timestamp for filenames.
-    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return time.strftime(_TS_COMPACT_FMT, time.gmtime())
 
 
 def _sanitize_filename(value: str) -> str:
     value = value.strip()
-    value = re.sub(r"[^a-zA-Z0-9_.-]+", "_", value)
+    # Telegram usernames are already [A-Za-z0-9_]; only fall back to the regex when deleting
+    # every safe byte leaves something behind.
+    if not value.isascii() or value.encode("ascii").translate(None, _FILENAME_SAFE_BYTES):
+        value = _FILENAME_RE.sub("_", value)
     return value[:120] if value else "telegram"
 
 
 def load_settings() -> Settings:
-    prompt_queue_dir = Path(os.getenv("PITCHAI_PROMPT_QUEUE_DIR", "/mnt/elise/prompts/telegram"))
-    http_queue_dir = Path(os.getenv("PITCHAI_HTTP_QUEUE_DIR", "/mnt/elise/prompts/http"))
+    prompt_queue_dir = Path(_env("PITCHAI_PROMPT_QUEUE_DIR", "/mnt/elise/prompts/telegram"))
+    http_queue_dir = Path(_env("PITCHAI_HTTP_QUEUE_DIR", "/mnt/elise/prompts/http"))
 
-    wrapper = os.getenv(
+    wrapper = _env(
         "PITCHAI_PROMPT_WRAPPER",
         (
             "## Telegram command\n"
@@ -113,11 +175,11 @@ def load_settings() -> Settings:
         ),
     )
 
-    dispatch_mode = os.getenv("PITCHAI_DISPATCH_MODE", "azure").strip().lower()
+    dispatch_mode = _env("PITCHAI_DISPATCH_MODE", "azure").strip().lower()
     if dispatch_mode not in ("azure", "local", "noop"):
         raise RuntimeError("PITCHAI_DISPATCH_MODE must be one of: azure, local, noop")
 
-    allowed_jobs_raw = os.getenv("PITCHAI_HTTP_ALLOWED_JOB_NAMES", "").strip()
+    allowed_jobs_raw = _env("PITCHAI_HTTP_ALLOWED_JOB_NAMES", "").strip()
     allowed_jobs = {j.strip() for j in allowed_jobs_raw.split(",") if j.strip()} if allowed_jobs_raw else set()
 
     return Settings(
@@ -132,7 +194,7 @@ def load_settings() -> Settings:
         aca_subscription_id=_optional_env("ACA_SUBSCRIPTION_ID"),
         aca_resource_group=_optional_env("ACA_RESOURCE_GROUP"),
         aca_job_name=_optional_env("ACA_JOB_NAME"),
-        aca_api_version=os.getenv("ACA_API_VERSION", "2025-01-01").strip() or "2025-01-01",
+        aca_api_version=_env("ACA_API_VERSION", "2025-01-01").strip() or "2025-01-01",
         local_dispatch_command=_optional_env("PITCHAI_LOCAL_DISPATCH_COMMAND"),
         dispatch_api_token=_optional_env("PITCHAI_DISPATCH_API_TOKEN"),
         http_queue_dir=http_queue_dir,
@@ -141,9 +203,59 @@ def load_settings() -> Settings:
     )
 
 
-def _telegram_send_message(bot_token: str, chat_id: str, text: str) -> None:
+_WrapperParts = Optional[tuple[tuple[str, Optional[str]], ...]]
+
+
+@lru_cache(maxsize=4)
+def _wrapper_parts(template: str) -> _WrapperParts:
+    """Pre-parse the prompt wrapper into (literal, field name) pairs.
+
+    Returns None when the template uses anything beyond bare ``{name}`` fields (format specs,
+    conversions, attribute/index access); those templates are rendered with ``str.format``.
+    """
+    parts: list[tuple[str, Optional[str]]] = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if field is not None and (spec or conversion or not field.isidentifier()):
+            return None
+        parts.append((literal, field))
+    return tuple(parts)
+
+
+def _render_prompt_wrapper(template: str, **values: Any) -> str:
+    parts = _wrapper_parts(template)
+    if parts is None:
+        return template.format(**values)
+    return "".join(literal if field is None else literal + str(values[field]) for literal, field in parts)
+
+
+# Queue dirs live on an Azure Files mount where even a no-op mkdir is a remote round-trip,
+# so each directory is created at most once per process.
+_ENSURED_DIRS: set[Path] = set()
+_ENSURED_DIRS_LOCK = threading.Lock()
+
+
+def _ensure_dir(path: Path) -> None:
+    if path in _ENSURED_DIRS:
+        return
+    with _ENSURED_DIRS_LOCK:
+        if path in _ENSURED_DIRS:
+            return
+        path.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(path)
+
+
+def _write_new_file(path: Path, data: bytes) -> None:
+    """Create `path` exclusively and write `data` with one open/write/close on the share."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+async def _telegram_send_message(bot_token: str, chat_id: str, text: str) -> None:
     url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-    resp = requests.post(url, json={"chat_id": chat_id, "text": text}, timeout=20)
+    resp = await _HTTPX.post(url, json={"chat_id": chat_id, "text": text}, timeout=20)
     resp.raise_for_status()
 
 
@@ -157,13 +269,14 @@ def _write_prompt_file(
     text: str,
 ) -> tuple[Path, bool]:
     ts_utc = _now_utc()
-    settings.prompt_queue_dir.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(settings.prompt_queue_dir)
     # Use a deterministic filename per update_id to avoid accidental duplicate processing
     # when Telegram retries the same update (timeouts, transient network errors, etc).
     filename = f"{update_id:012d}_{_sanitize_filename(from_username)}.md"
     path = settings.prompt_queue_dir / filename
 
-    payload = settings.prompt_wrapper_template.format(
+    payload = _render_prompt_wrapper(
+        settings.prompt_wrapper_template,
         ts_utc=ts_utc,
         update_id=update_id,
         chat_id=chat_id,
@@ -172,8 +285,7 @@ def _write_prompt_file(
         text=text.rstrip(),
     )
     try:
-        with path.open("x", encoding="utf-8") as file_handle:
-            file_handle.write(payload + "\n")
+        _write_new_file(path, (payload + "\n").encode("utf-8"))
     except FileExistsError:
         return (path, False)
     return (path, True)
@@ -255,15 +367,15 @@ def _parse_dispatch_request(payload: Any) -> DispatchRequest:
 
 
 def _write_http_dispatch_bundle(settings: Settings, req: DispatchRequest) -> Path:
-    settings.http_queue_dir.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(settings.http_queue_dir)
 
     ts = _now_utc_compact()
-    rid = uuid4().hex[:12]
+    rid = base64.b32encode(os.urandom(8)).rstrip(b"=").decode("ascii").lower()
     bundle = settings.http_queue_dir / f"{ts}_{rid}"
     bundle.mkdir(parents=False, exist_ok=False)
 
-    (bundle / "prompt.md").write_text(req.prompt.rstrip() + "\n", encoding="utf-8")
-    (bundle / "config.toml").write_text(req.config_toml.rstrip() + "\n", encoding="utf-8")
+    _write_new_file(bundle / "prompt.md", (req.prompt.rstrip() + "\n").encode("utf-8"))
+    _write_new_file(bundle / "config.toml", (req.config_toml.rstrip() + "\n").encode("utf-8"))
     meta = {
         "ts_utc": _now_utc(),
         "state_key": req.state_key,
@@ -278,71 +390,103 @@ def _write_http_dispatch_bundle(settings: Settings, req: DispatchRequest) -> Pat
         "git_base": req.git_base,
         "git_clone_dir_rel": req.git_clone_dir_rel,
     }
-    (bundle / "meta.json").write_text(json.dumps(meta, indent=2) + "\n", encoding="utf-8")
+    _write_new_file(bundle / "meta.json", _json_dumps_pretty_bytes(meta) + b"\n")
     return bundle
 
 
-def _aca_start_job_named(settings: Settings, job_name: str) -> str:
-    assert settings.aca_subscription_id and settings.aca_resource_group
-    url = (
+@lru_cache(maxsize=64)
+def _aca_job_url(subscription_id: str, resource_group: str, job_name: str, action: str, api_version: str) -> str:
+    return (
         "https://management.azure.com/subscriptions/"
-        f"{settings.aca_subscription_id}/resourceGroups/{settings.aca_resource_group}"
-        f"/providers/Microsoft.App/jobs/{job_name}/start"
-        f"?api-version={settings.aca_api_version}"
+        f"{subscription_id}/resourceGroups/{resource_group}"
+        f"/providers/Microsoft.App/jobs/{job_name}/{action}"
+        f"?api-version={api_version}"
+    )
+
+
+async def _aca_start_job_named(settings: Settings, job_name: str) -> str:
+    assert settings.aca_subscription_id and settings.aca_resource_group
+    url = _aca_job_url(
+        settings.aca_subscription_id, settings.aca_resource_group, job_name, "start", settings.aca_api_version
     )
-    token = _aca_token()
-    resp = requests.post(url, headers={"Authorization": f"Bearer {token}"}, timeout=30)
+    token = await _aca_token_async()
+    resp = await _HTTPX.post(url, headers={"Authorization": f"Bearer {token}"})
     resp.raise_for_status()
-    data = resp.json()
+    _remember_running(job_name, True)
+    data = _json_loads(resp.content)
     name = data.get("name")
     return str(name) if isinstance(name, str) else "unknown"
 
 
+_AZ_CREDENTIAL: Any = None
+_AZ_TOKEN_CACHE: Optional[tuple[str, float]] = None
+_AZ_TOKEN_LOCK = threading.Lock()
+# Refresh the management token this many seconds before it actually expires.
+_AZ_TOKEN_REFRESH_MARGIN_S = 300.0
+
+
 def _aca_token() -> str:
+    global _AZ_CREDENTIAL, _AZ_TOKEN_CACHE
     if DefaultAzureCredential is None:
         raise RuntimeError("azure-identity is not available in this environment")
-    cred = DefaultAzureCredential()
-    return cred.get_token("https://management.azure.com/.default").token
+    with _AZ_TOKEN_LOCK:
+        cached = _AZ_TOKEN_CACHE
+        if cached is not None and cached[1] - time.time() > _AZ_TOKEN_REFRESH_MARGIN_S:
+            return cached[0]
+        if _AZ_CREDENTIAL is None:
+            _AZ_CREDENTIAL = DefaultAzureCredential()
+        access = _AZ_CREDENTIAL.get_token("https://management.azure.com/.default")
+        _AZ_TOKEN_CACHE = (access.token, float(access.expires_on))
+        return access.token
 
 
-def _aca_list_executions(settings: Settings) -> list[dict[str, Any]]:
-    assert settings.aca_subscription_id and settings.aca_resource_group and settings.aca_job_name
-    url = (
-        "https://management.azure.com/subscriptions/"
-        f"{settings.aca_subscription_id}/resourceGroups/{settings.aca_resource_group}"
-        f"/providers/Microsoft.App/jobs/{settings.aca_job_name}/executions"
-        f"?api-version={settings.aca_api_version}"
+async def _aca_token_async() -> str:
+    # azure-identity's sync credential may hit the network; keep it off the event loop.
+    return await asyncio.to_thread(_aca_token)
+
+
+async def _aca_list_executions(settings: Settings, job_name: str) -> list[dict[str, Any]]:
+    assert settings.aca_subscription_id and settings.aca_resource_group
+    url = _aca_job_url(
+        settings.aca_subscription_id, settings.aca_resource_group, job_name, "executions", settings.aca_api_version
+    )
+    token = await _aca_token_async()
+    # Let the management plane drop finished executions; callers still check the status.
+    resp = await _HTTPX.get(
+        url,
+        headers={"Authorization": f"Bearer {token}"},
+        params={"$filter": "properties/status eq 'Running'"},
     )
-    token = _aca_token()
-    resp = requests.get(url, headers={"Authorization": f"Bearer {token}"}, timeout=30)
     resp.raise_for_status()
-    data = resp.json()
+    data = _json_loads(resp.content)
     value = data.get("value", [])
     return value if isinstance(value, list) else []
 
 
-def _aca_has_running_execution(settings: Settings) -> bool:
-    for item in _aca_list_executions(settings):
-        props = item.get("properties")
-        if isinstance(props, dict) and props.get("status") == "Running":
-            return True
-    return False
+# job name -> (has running execution, time.monotonic() when observed). Only touched from the
+# event loop, so no lock is needed.
+_RUNNING_CACHE: dict[str, tuple[bool, float]] = {}
+_RUNNING_CACHE_TTL_S = 10.0
 
 
-def _aca_start_job(settings: Settings) -> str:
-    assert settings.aca_subscription_id and settings.aca_resource_group and settings.aca_job_name
-    url = (
-        "https://management.azure.com/subscriptions/"
-        f"{settings.aca_subscription_id}/resourceGroups/{settings.aca_resource_group}"
-        f"/providers/Microsoft.App/jobs/{settings.aca_job_name}/start"
-        f"?api-version={settings.aca_api_version}"
-    )
-    token = _aca_token()
-    resp = requests.post(url, headers={"Authorization": f"Bearer {token}"}, timeout=30)
-    resp.raise_for_status()
-    data = resp.json()
-    name = data.get("name")
-    return str(name) if isinstance(name, str) else "unknown"
+def _remember_running(job_name: str, running: bool) -> None:
+    _RUNNING_CACHE[job_name] = (running, time.monotonic())
+
+
+async def _aca_has_running_execution(settings: Settings, job_name: str) -> bool:
+    cached = _RUNNING_CACHE.get(job_name)
+    if cached is not None and time.monotonic() - cached[1] < _RUNNING_CACHE_TTL_S:
+        return cached[0]
+
+    executions = await _aca_list_executions(settings, job_name)
+    running = any((item.get("properties") or {}).get("status") == "Running" for item in executions)
+    _remember_running(job_name, running)
+    return running
+
+
+async def _aca_start_job(settings: Settings) -> str:
+    assert settings.aca_job_name
+    return await _aca_start_job_named(settings, settings.aca_job_name)
 
 
 def _local_dispatch(settings: Settings) -> None:
@@ -356,6 +500,56 @@ app = FastAPI()
 SETTINGS = load_settings()
 
 
+# Telegram updates tend to arrive in bursts, and one running execution drains the whole
+# prompt queue. Webhooks only signal this event; a single background loop coalesces the
+# signals and talks to the ACA management plane at most once per debounce window.
+_DISPATCH_DEBOUNCE_S = 0.5
+_DISPATCH_EVENT = asyncio.Event()
+_DISPATCH_TASK: Optional[asyncio.Task[None]] = None
+
+
+async def _dispatch_loop() -> None:
+    while True:
+        await _DISPATCH_EVENT.wait()
+        # Let the rest of the burst land before checking/starting the job.
+        await asyncio.sleep(_DISPATCH_DEBOUNCE_S)
+        _DISPATCH_EVENT.clear()
+
+        try:
+            if await _aca_has_running_execution(SETTINGS, SETTINGS.aca_job_name):
+                continue
+        except Exception as exc:  # noqa: BLE001
+            # Safety: if we can't check running state, do not attempt to start a new execution.
+            # The prompt remains queued and will be picked up by the scheduled run.
+            print(f"[dispatch] failed checking running executions: {exc}", file=sys.stderr, flush=True)
+            continue
+
+        try:
+            await _aca_start_job(SETTINGS)
+        except Exception as exc:  # noqa: BLE001
+            print(f"[dispatch] failed to start job: {exc}", file=sys.stderr, flush=True)
+
+
+@app.on_event("startup")
+async def _start_dispatch_loop() -> None:
+    global _DISPATCH_TASK
+    for queue_dir in (SETTINGS.prompt_queue_dir, SETTINGS.http_queue_dir):
+        try:
+            _ensure_dir(queue_dir)
+        except OSError as exc:
+            # The share may not be mounted yet; the first request will retry.
+            print(f"[startup] failed creating {queue_dir}: {exc}", file=sys.stderr, flush=True)
+    if SETTINGS.dispatch_mode == "azure":
+        _DISPATCH_TASK = asyncio.create_task(_dispatch_loop())
+
+
+@app.on_event("shutdown")
+async def _close_http_client() -> None:
+    if _DISPATCH_TASK is not None:
+        _DISPATCH_TASK.cancel()
+    await _HTTPX.aclose()
+
+
 @app.get("/healthz", response_class=PlainTextResponse)
 def healthz() -> str:
     return "ok"
@@ -369,13 +563,13 @@ async def dispatch(
     expected = SETTINGS.dispatch_api_token
     if expected:
         got = (x_pitchai_dispatch_token or "").strip()
-        if got != expected:
+        if not _secret_matches(got, expected):
             raise HTTPException(status_code=401, detail="invalid dispatch token")
     else:
         raise HTTPException(status_code=500, detail="dispatch not configured")
 
     try:
-        payload = await request.json()
+        payload = _json_loads(await request.body())
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=400, detail=f"invalid json: {exc}") from exc
 
@@ -400,15 +594,14 @@ async def dispatch(
 
     # Best-effort: avoid duplicate running executions if we can.
     try:
-        SETTINGS_JOB = Settings(**{**SETTINGS.__dict__, "aca_job_name": job_name})  # type: ignore[arg-type]
-        if _aca_has_running_execution(SETTINGS_JOB):
+        if await _aca_has_running_execution(SETTINGS, job_name):
             return f"queued:{bundle.name}"
     except Exception as exc:  # noqa: BLE001
         print(f"[dispatch] failed checking running executions: {exc}", file=sys.stderr, flush=True)
         return f"queued:{bundle.name}"
 
     try:
-        _aca_start_job_named(SETTINGS, job_name)
+        await _aca_start_job_named(SETTINGS, job_name)
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=500, detail=f"failed to start job: {exc}") from exc
 
@@ -420,39 +613,48 @@ async def telegram_webhook(
     request: Request,
     x_telegram_bot_api_secret_token: Optional[str] = Header(default=None),
 ) -> str:
-    if SETTINGS.telegram_webhook_secret and x_telegram_bot_api_secret_token != SETTINGS.telegram_webhook_secret:
-        got = x_telegram_bot_api_secret_token or ""
-        expected = SETTINGS.telegram_webhook_secret
-        got_sha = hashlib.sha256(got.encode("utf-8")).hexdigest()
-        expected_sha = hashlib.sha256(expected.encode("utf-8")).hexdigest()
-        print(
-            f"[auth] webhook secret mismatch got_sha={got_sha} expected_sha={expected_sha} got_len={len(got)} expected_len={len(expected)}",
-            file=sys.stderr,
-            flush=True,
-        )
+    if SETTINGS.telegram_webhook_secret and not _secret_matches(
+        x_telegram_bot_api_secret_token, SETTINGS.telegram_webhook_secret
+    ):
+        if _DEBUG_AUTH:
+            got = x_telegram_bot_api_secret_token or ""
+            expected = SETTINGS.telegram_webhook_secret
+            got_sha = hashlib.sha256(got.encode("utf-8")).hexdigest()
+            expected_sha = hashlib.sha256(expected.encode("utf-8")).hexdigest()
+            print(
+                f"[auth] webhook secret mismatch got_sha={got_sha} expected_sha={expected_sha} got_len={len(got)} expected_len={len(expected)}",
+                file=sys.stderr,
+                flush=True,
+            )
+        else:
+            print("[auth] webhook secret mismatch", file=sys.stderr, flush=True)
         raise HTTPException(status_code=401, detail="invalid telegram secret token")
 
     try:
-        update = await request.json()
+        update = _json_loads(await request.body())
     except Exception as exc:  # noqa: BLE001
         raise HTTPException(status_code=400, detail=f"invalid json: {exc}") from exc
 
     if not isinstance(update, dict):
         raise HTTPException(status_code=400, detail="invalid update payload")
 
-    update_id = update.get("update_id")
-    message = update.get("message") or update.get("edited_message")
-    if not isinstance(update_id, int) or not isinstance(message, dict):
+    # Well-formed text messages take the straight path; anything missing or mistyped is ignored.
+    try:
+        update_id = update["update_id"]
+        message = update.get("message") or update["edited_message"]
+        chat_id = str(message["chat"]["id"])
+        sender = message["from"]
+        from_user_id = str(sender["id"])
+        sender_is_bot = sender.get("is_bot")
+        from_username = str(sender.get("username") or sender.get("first_name") or "user")
+        text = message["text"]
+    except (KeyError, TypeError, AttributeError):
+        return "ignored"
+    if type(update_id) is not int or type(text) is not str or not text.strip():
         return "ignored"
 
-    chat = message.get("chat") if isinstance(message.get("chat"), dict) else {}
-    chat_id = str(chat.get("id", ""))
     if SETTINGS.allowed_chat_id and chat_id != SETTINGS.allowed_chat_id:
         return "ignored"
-
-    sender = message.get("from") if isinstance(message.get("from"), dict) else {}
-    from_user_id = str(sender.get("id", ""))
-    sender_is_bot = sender.get("is_bot")
     if sender_is_bot is True:
         return "ignored"
     if SETTINGS.telegram_bot_user_id and from_user_id == SETTINGS.telegram_bot_user_id:
@@ -460,11 +662,6 @@ async def telegram_webhook(
     if SETTINGS.allowed_user_id and from_user_id != SETTINGS.allowed_user_id:
         return "ignored"
 
-    from_username = str(sender.get("username") or sender.get("first_name") or "user")
-    text = message.get("text")
-    if not isinstance(text, str) or not text.strip():
-        return "ignored"
-
     prompt_path, created = _write_prompt_file(
         SETTINGS,
         update_id=update_id,
@@ -476,7 +673,7 @@ async def telegram_webhook(
 
     if created:
         try:
-            _telegram_send_message(SETTINGS.telegram_bot_token, chat_id, f"Queued for Elise: {prompt_path.name}")
+            await _telegram_send_message(SETTINGS.telegram_bot_token, chat_id, f"Queued for Elise: {prompt_path.name}")
         except Exception:
             pass
 
@@ -495,18 +692,5 @@ async def telegram_webhook(
     if not created:
         return "ok"
 
-    try:
-        if _aca_has_running_execution(SETTINGS):
-            return "ok"
-    except Exception as exc:  # noqa: BLE001
-        # Safety: if we can't check running state, do not attempt to start a new execution.
-        # The prompt remains queued and will be picked up by the scheduled run.
-        print(f"[dispatch] failed checking running executions: {exc}", file=sys.stderr, flush=True)
-        return "ok"
-
-    try:
-        _aca_start_job(SETTINGS)
-    except Exception as exc:  # noqa: BLE001
-        raise HTTPException(status_code=500, detail=f"failed to start job: {exc}") from exc
-
+    _DISPATCH_EVENT.set()
     return "ok"
@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+import functools
 import json
 import os
 import random
@@ -14,6 +15,13 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+_HOME = Path.home()
+_bootstrapped: set[Path] = set()
 
 ADJECTIVES = [
     "adaptable",
@@ -90,18 +98,22 @@ def slugify_candidate(adjective: str, animal: str) -> str:
     return f"{adjective.lower()}-{animal.lower()}"
 
 
+_SLUG_POOL = [slugify_candidate(adjective, animal) for adjective in ADJECTIVES for animal in ANIMALS]
+
+
 def random_slug(existing: Dict[str, Any]) -> str:
-    while True:
-        slug = slugify_candidate(random.choice(ADJECTIVES), random.choice(ANIMALS))
-        if slug not in existing:
-            return slug
+    available = [slug for slug in _SLUG_POOL if slug not in existing]
+    if not available:
+        raise ValueError("All colleague ids are in use; remove entries from the colleague index")
+    return random.choice(available)
 
 
+@functools.cache
 def resolve_codex_home() -> Path:
     colleague_home = os.environ.get("CODEX_COLLEAGUE_HOME")
     if colleague_home:
         path = Path(colleague_home).expanduser()
-        path.mkdir(parents=True, exist_ok=True)
+        os.makedirs(path, exist_ok=True)
         os.environ["CODEX_HOME"] = str(path)
         bootstrap_codex_home_if_needed(path)
         return path
@@ -109,36 +121,61 @@ def resolve_codex_home() -> Path:
     env_home = os.environ.get("CODEX_HOME")
     if env_home:
         path = Path(env_home).expanduser()
-        path.mkdir(parents=True, exist_ok=True)
+        os.makedirs(path, exist_ok=True)
         return path
     turn_cwd = os.environ.get("CODEX_TURN_CWD")
     if turn_cwd:
         fallback = Path(turn_cwd).expanduser() / ".codex_home"
         os.environ["CODEX_HOME"] = str(fallback)
-        fallback.mkdir(parents=True, exist_ok=True)
+        os.makedirs(fallback, exist_ok=True)
         bootstrap_codex_home_if_needed(fallback)
         return fallback
-    default_path = Path.home() / ".codex"
+    default_path = _HOME / ".codex"
     os.environ["CODEX_HOME"] = str(default_path)
-    default_path.mkdir(parents=True, exist_ok=True)
+    os.makedirs(default_path, exist_ok=True)
     return default_path
 
 
+_BOOTSTRAP_SKIP = frozenset({"sessions", "live"})
+
+
+def _copy_codex_home(source: Path, dest: Path) -> None:
+    # Copies rather than hardlinks: the colleague appends to history and rewrites auth/config,
+    # and those writes must not leak back into the parent ~/.codex. shutil.copy2 goes through
+    # the kernel's zero-copy path (sendfile) on Linux and keeps modes, e.g. 0600 on auth.json.
+    stack = [(str(source), str(dest))]
+    while stack:
+        src_dir, dst_dir = stack.pop()
+        os.makedirs(dst_dir, exist_ok=True)
+        with os.scandir(src_dir) as entries:
+            for entry in entries:
+                if entry.name in _BOOTSTRAP_SKIP:
+                    continue
+                target = os.path.join(dst_dir, entry.name)
+                if entry.is_dir():
+                    stack.append((entry.path, target))
+                elif entry.is_file():
+                    shutil.copy2(entry.path, target)
+
+
 def bootstrap_codex_home_if_needed(codex_home: Path) -> None:
-    source = Path.home() / ".codex"
-    if not source.exists():
+    if codex_home in _bootstrapped:
+        return
+    _bootstrapped.add(codex_home)
+    source = _HOME / ".codex"
+    try:
+        os.stat(source)
+    except OSError:
         return
     # Avoid needless copies when the fallback already mirrors the source.
     marker = codex_home / ".bootstrapped"
-    if marker.exists():
+    try:
+        os.stat(marker)
         return
+    except OSError:
+        pass
     try:
-        shutil.copytree(
-            source,
-            codex_home,
-            dirs_exist_ok=True,
-            ignore=shutil.ignore_patterns("sessions", "live"),
-        )
+        _copy_codex_home(source, codex_home)
         marker.touch()
     except OSError as exc:  # pragma: no cover - best-effort copy
         print(
@@ -147,6 +184,7 @@ def bootstrap_codex_home_if_needed(codex_home: Path) -> None:
         )
 
 
+@functools.cache
 def index_paths() -> Tuple[Path, Path]:
     codex_home = resolve_codex_home()
     base_dir = codex_home / "colleagues"
@@ -168,9 +206,17 @@ def save_index(data: Dict[str, Any]) -> None:
     base_dir, index_path = index_paths()
     base_dir.mkdir(parents=True, exist_ok=True)
     tmp_path = index_path.with_suffix(".tmp")
-    with tmp_path.open("w", encoding="utf-8") as handle:
-        json.dump(data, handle, indent=2)
-    tmp_path.replace(index_path)
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode("utf-8")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, payload)
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, index_path)
 
 
 def build_command(new_thread: bool, conversation_id: str | None, prompt: str) -> List[str]:
@@ -202,31 +248,46 @@ def run_codex(cmd: List[str]) -> Tuple[str, str]:
         cmd,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        text=True,
-        env=os.environ.copy(),
+        bufsize=1024 * 1024,
+        env=os.environ,
     )
     thread_id: str | None = None
     final_message: str | None = None
+    loads = orjson.loads if orjson is not None else json.loads
+    decode_error = orjson.JSONDecodeError if orjson is not None else json.JSONDecodeError
     assert proc.stdout is not None  # for type checkers
-    for line in proc.stdout:
-        line = line.strip()
-        if not line:
-            continue
-        try:
-            event = json.loads(line)
-        except json.JSONDecodeError:
-            continue
-        if event.get("type") == "thread.started" and not thread_id:
-            thread_id = event.get("thread_id")
-        if event.get("type") == "item.completed":
-            item = event.get("item", {})
-            if item.get("type") == "agent_message":
-                final_message = item.get("text")
-    stdout_data, stderr_data = proc.communicate()
-    if proc.returncode != 0:
-        raise RuntimeError(
-            f"codex-dev exited with {proc.returncode}: {stderr_data.strip() or stdout_data.strip()}"
-        )
+    # Read the event stream in large blocks and split lines ourselves; the final answer is
+    # only needed once the process exits, so there is no reason to wake up per event.
+    pending = b""
+    while True:
+        chunk = proc.stdout.read(65536)
+        if chunk:
+            *lines, pending = (pending + chunk).split(b"\n")
+        else:
+            lines, pending = [pending], b""
+        for line in lines:
+            # Only two event types matter; skip decoding everything else (deltas, tool calls, ...).
+            if b'"thread.started"' not in line and b'"item.completed"' not in line:
+                continue
+            try:
+                event = loads(line)
+            except decode_error:
+                continue
+            if not isinstance(event, dict):
+                continue
+            if event.get("type") == "thread.started" and not thread_id:
+                thread_id = event.get("thread_id")
+            if event.get("type") == "item.completed":
+                item = event.get("item", {})
+                if item.get("type") == "agent_message":
+                    final_message = item.get("text")
+        if not chunk:
+            break
+    assert proc.stderr is not None
+    stderr_data = proc.stderr.read().decode("utf-8", "replace")
+    returncode = proc.wait()
+    if returncode != 0:
+        raise RuntimeError(f"codex-dev exited with {returncode}: {stderr_data.strip()}")
     if not thread_id:
         raise RuntimeError("Failed to capture conversation id from codex output")
     if final_message is None:
@@ -7,10 +7,32 @@ import os
 import pathlib
 import sys
 from datetime import datetime, timezone
-from typing import Iterable
+from typing import Any, Iterable, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 DEFAULT_OUTPUT = pathlib.Path(__file__).with_name("tool_calls.jsonl")
 LOG_ENV = "CODEX_TOOL_HOOK_LOG"
+FILTER_ENV = "CODEX_TOOL_HOOK_FILTER"
+
+
+def encode_line(payload: Any) -> bytes:
+    """Serialize one JSONL record (including the trailing newline) as bytes."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(payload) + "\n").encode("utf-8")
+
+
+def append_line(path: pathlib.Path, data: bytes) -> None:
+    # A single O_APPEND write keeps concurrent hook invocations from interleaving lines.
+    fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
 
 
 def resolve_output_path(argv: Iterable[str]) -> pathlib.Path:
@@ -33,23 +55,56 @@ def resolve_output_path(argv: Iterable[str]) -> pathlib.Path:
     return DEFAULT_OUTPUT
 
 
+def splice_timestamp(raw: bytes) -> Optional[bytes]:
+    """Add a timestamp to a single-line JSON object without re-serializing it.
+
+    The payload is still parsed to validate it. Returns None when it is not a valid one-line
+    object; callers then fall back to the parse path, which reports the error.
+    """
+    body = raw.strip()
+    if not (body.startswith(b"{") and body.endswith(b"}")) or b"\n" in body:
+        return None
+    try:
+        payload = orjson.loads(body) if orjson is not None else json.loads(body)
+    except ValueError:
+        return None
+    if "timestamp" in payload:
+        return body + b"\n"
+    stamp = datetime.now(tz=timezone.utc).isoformat().encode("ascii")
+    sep = b"," if payload else b""
+    return body[:-1] + sep + b'"timestamp":"' + stamp + b'"}\n'
+
+
 def main() -> int:
     try:
-        payload = json.load(sys.stdin)
+        raw = sys.stdin.buffer.read()
     except Exception as exc:  # noqa: BLE001
         # best-effort logging; swallow errors so hooks never break Codex.
         sys.stderr.write(f"tool_hook_logger: failed to read payload: {exc}\n")
         return 0
 
-    payload.setdefault("timestamp", datetime.now(tz=timezone.utc).isoformat())
+    # Optional opt-in filter: only log payloads whose raw JSON contains this substring
+    # (for example a tool name), checked before any parsing.
+    needle = os.environ.get(FILTER_ENV)
+    if needle and needle.encode("utf-8") not in raw:
+        return 0
+
+    line = splice_timestamp(raw)
+    if line is None:
+        try:
+            payload = orjson.loads(raw) if orjson is not None else json.loads(raw)
+        except Exception as exc:  # noqa: BLE001
+            sys.stderr.write(f"tool_hook_logger: failed to read payload: {exc}\n")
+            return 0
+        if "timestamp" not in payload:
+            payload["timestamp"] = datetime.now(tz=timezone.utc).isoformat()
+        line = encode_line(payload)
 
     output_path = resolve_output_path(sys.argv[1:])
     output_path.parent.mkdir(parents=True, exist_ok=True)
 
     try:
-        with output_path.open("a", encoding="utf-8") as fh:
-            json.dump(payload, fh)
-            fh.write("\n")
+        append_line(output_path, line)
     except Exception as exc:  # noqa: BLE001
         sys.stderr.write(f"tool_hook_logger: failed to append to {output_path}: {exc}\n")
     return 0
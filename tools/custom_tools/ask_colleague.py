@@ -9,7 +9,8 @@ target script ever moves, this shim will fail loudly so we notice quickly.
 
 from __future__ import annotations
 
-import runpy
+import importlib.util
+import os
 from pathlib import Path
 import sys
 
@@ -17,10 +18,18 @@ import sys
 def main() -> None:
     repo_root = Path(__file__).resolve().parents[2]
     target = repo_root / "codex-rs" / "tools" / "custom_tools" / "ask_colleague.py"
-    if not target.exists():
+    try:
+        os.stat(target)
+    except OSError:
         sys.stderr.write(f"ask_colleague shim: missing target script {target}\n")
         sys.exit(2)
-    runpy.run_path(str(target), run_name="__main__")
+    # Load through the regular import machinery so the target's bytecode is cached in
+    # __pycache__ instead of being recompiled on every call (runpy.run_path never caches).
+    spec = importlib.util.spec_from_file_location("_ask_colleague_impl", target)
+    assert spec is not None and spec.loader is not None
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    sys.exit(module.main())
 
 
 if __name__ == "__main__":
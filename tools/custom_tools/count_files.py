@@ -17,6 +17,45 @@ def _load_args() -> Dict[str, Any]:
         return {"error": f"invalid arguments: {exc}"}
 
 
+def _count_files(root: str, follow_symlinks: bool, include_hidden: bool) -> int:
+    """Walk `root` with os.scandir, pruning hidden entries before descending.
+
+    DirEntry caches the d_type from getdents, so plain files and directories cost no
+    extra stat. Symlinked directories are only entered when `follow_symlinks` is set.
+    """
+    count = 0
+    # When following symlinks the same directory can be reached twice (or in a cycle), so
+    # directories are deduplicated by (st_dev, st_ino).
+    seen_dirs: set[tuple[int, int]] = set()
+    if follow_symlinks:
+        st = os.stat(root)
+        seen_dirs.add((st.st_dev, st.st_ino))
+    stack = [root]
+    while stack:
+        try:
+            it = os.scandir(stack.pop())
+        except OSError:
+            continue
+        with it:
+            for entry in it:
+                if not include_hidden and entry.name.startswith("."):
+                    continue
+                try:
+                    if entry.is_dir(follow_symlinks=follow_symlinks):
+                        if follow_symlinks:
+                            st = entry.stat()
+                            key = (st.st_dev, st.st_ino)
+                            if key in seen_dirs:
+                                continue
+                            seen_dirs.add(key)
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        count += 1
+                except OSError:
+                    continue
+    return count
+
+
 def main() -> None:
     args = _load_args()
     target = Path(args.get("path") or ".")
@@ -27,17 +66,7 @@ def main() -> None:
         print(json.dumps({"error": f"path does not exist: {target}"}))
         return
 
-    count = 0
-    for entry in target.rglob("*") if follow_symlinks else target.glob("**/*"):
-        try:
-            is_file = entry.is_file()
-        except OSError:
-            continue
-        if not is_file:
-            continue
-        if not include_hidden and any(part.startswith(".") for part in entry.parts):
-            continue
-        count += 1
+    count = _count_files(str(target), follow_symlinks, include_hidden)
 
     print(
         json.dumps(
@@ -9,7 +9,7 @@ README_extensive.md to demonstrate custom CLI tools.
 import json
 import os
 import sys
-from datetime import datetime
+from datetime import datetime, timezone
 
 PREFIX = os.environ.get("CUSTOM_TOOL_PREFIX", "Custom tool says: ")
 ARGS_ENV = os.environ.get("CODEX_TOOL_ARGS_JSON", "{}")
@@ -21,5 +21,5 @@ except json.JSONDecodeError as exc:
     sys.exit(1)
 
 text = payload.get("text", "")
-stamp = datetime.utcnow().isoformat()
+stamp = datetime.now(timezone.utc).isoformat()
 print(f"{PREFIX}{text} @ {stamp}")
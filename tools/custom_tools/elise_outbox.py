@@ -0,0 +1,114 @@
+"""Outbox log and index shared by the Elise email tools.
+
+`elise_outbox_log.jsonl` is the append-only record of every send. `elise_outbox_index.json`
+maps internet message ids to their latest entry (including wait state) and is read by Elise
+core as well, so every send updates it directly.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Dict
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+from elise_paths import resolve_elise_core_root
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+ELISE_CORE_ROOT = resolve_elise_core_root()
+OUTBOX_DIR = ELISE_CORE_ROOT / "logs"
+OUTBOX_INDEX = OUTBOX_DIR / "elise_outbox_index.json"
+OUTBOX_LOG = OUTBOX_DIR / "elise_outbox_log.jsonl"
+# "<inode> <offset>" of the log position already folded into the index.
+OUTBOX_LOG_OFFSET = OUTBOX_DIR / "elise_outbox_log.offset"
+
+
+def load_index() -> Dict[str, dict]:
+    try:
+        raw = OUTBOX_INDEX.read_bytes()
+    except FileNotFoundError:
+        return {}
+    # The index is always an object; skip the parser for empty or foreign files.
+    if raw.lstrip()[:1] != b"{":
+        return {}
+    try:
+        return _loads(raw)
+    except ValueError:
+        return {}
+
+
+def save_index(index: Dict[str, dict]) -> None:
+    OUTBOX_DIR.mkdir(parents=True, exist_ok=True)
+    if orjson is not None:
+        data = orjson.dumps(index, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(index, indent=2).encode("utf-8")
+    # Write a sibling temp file and rename it so readers never see a half-written index.
+    tmp_path = OUTBOX_INDEX.with_name(f"{OUTBOX_INDEX.name}.{os.getpid()}.tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, OUTBOX_INDEX)
+
+
+def record_send(entry: dict) -> None:
+    """Merge a freshly logged send into the index."""
+    internet_id = entry.get("internet_message_id")
+    if not internet_id:
+        return
+    index = load_index()
+    index[internet_id] = entry
+    save_index(index)
+
+
+def _read_log_offset(inode: int) -> int:
+    try:
+        saved_inode, offset = OUTBOX_LOG_OFFSET.read_text(encoding="ascii").split()
+        return int(offset) if int(saved_inode) == inode else 0
+    except (OSError, ValueError):
+        return 0
+
+
+def rebuild_index_if_stale() -> Dict[str, dict]:
+    """Return the index, first folding in any log lines it has not seen yet.
+
+    Sends update the index themselves; this catches entries an older tool version or a
+    concurrent index writer left out. Only the log tail past the recorded offset is read,
+    and existing entries keep their wait state.
+    """
+    index = load_index()
+    try:
+        st = OUTBOX_LOG.stat()
+    except FileNotFoundError:
+        return index
+    offset = _read_log_offset(st.st_ino)
+    if offset > st.st_size:
+        # The log was truncated in place; fold it again from the start.
+        offset = 0
+    if offset == st.st_size:
+        return index
+
+    with OUTBOX_LOG.open("rb") as handle:
+        handle.seek(offset)
+        tail = handle.read()
+    # Leave a partially written last line for the next call.
+    complete = tail[: tail.rfind(b"\n") + 1]
+    changed = False
+    for line in complete.splitlines():
+        if not line.startswith(b"{"):
+            continue
+        try:
+            entry = _loads(line)
+        except ValueError:
+            continue
+        internet_id = entry.get("internet_message_id")
+        if internet_id and internet_id not in index:
+            index[internet_id] = entry
+            changed = True
+    if changed:
+        save_index(index)
+    OUTBOX_LOG_OFFSET.write_text(f"{st.st_ino} {offset + len(complete)}", encoding="ascii")
+    return index
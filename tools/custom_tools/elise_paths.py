@@ -0,0 +1,28 @@
+"""Locate the Elise core checkout for the Elise custom tools."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+
+def resolve_elise_core_root() -> Path:
+    env_root = os.environ.get("CODEX_ELISE_CORE_ROOT") or os.environ.get("ELISE_CORE_ROOT")
+    if env_root:
+        # Trust the configured path; a bad value surfaces when the caller first uses it.
+        return Path(os.path.abspath(os.path.expanduser(env_root)))
+
+    script_dir = os.path.dirname(os.path.realpath(__file__))
+    while True:
+        candidate = os.path.join(script_dir, "Elise", "core")
+        if os.path.isdir(candidate):
+            return Path(candidate).resolve()
+        parent = os.path.dirname(script_dir)
+        if parent == script_dir:
+            break
+        script_dir = parent
+
+    raise SystemExit(
+        "Elise core repo not found. Set CODEX_ELISE_CORE_ROOT (or ELISE_CORE_ROOT) "
+        "to the absolute path of the Elise/core checkout."
+    )
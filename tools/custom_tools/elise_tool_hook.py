@@ -2,17 +2,29 @@
 """Elise-specific tool hook: log DevTools calls + extend sleep timeouts."""
 from __future__ import annotations
 
+import functools
 import json
 import pathlib
 import sys
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Sequence, Union
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 DEVTOOLS_LOG = pathlib.Path(__file__).with_name("chrome_devtools_actions.jsonl")
 SLEEP_DIRECTIVE = {"local_shell": {"timeout_ms": "infinite"}}
 DEBUG_LOG = pathlib.Path.home() / ".codex" / "elise_sleep_hook_debug.jsonl"
 
 
+@functools.cache
+def now_iso() -> str:
+    """UTC timestamp for this hook invocation; every record written by it shares one clock read."""
+    return datetime.now(tz=timezone.utc).isoformat()
+
+
 def log_error(message: str) -> None:
     sys.stderr.write(f"elise_tool_hook: {message}\n")
 
@@ -21,7 +33,7 @@ def log_debug(label: str, info: Dict[str, Any]) -> None:
     record = {
         "label": label,
         "info": info,
-        "logged_at": datetime.now(tz=timezone.utc).isoformat(),
+        "logged_at": now_iso(),
     }
     try:
         DEBUG_LOG.parent.mkdir(parents=True, exist_ok=True)
@@ -32,9 +44,9 @@ def log_debug(label: str, info: Dict[str, Any]) -> None:
         pass
 
 
-def load_event() -> Dict[str, Any]:
+def load_event(raw: bytes) -> Dict[str, Any]:
     try:
-        return json.load(sys.stdin)
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
     except Exception as exc:  # noqa: BLE001
         raise SystemExit(f"failed to read JSON payload: {exc}")
 
@@ -44,11 +56,11 @@ def log_devtools(event: Dict[str, Any]) -> None:
     tool_name = call.get("tool_name", "")
     if not tool_name.startswith("mcp__chrome-devtools"):
         return
-    entry = dict(event)
-    entry.setdefault("logged_at", datetime.now(tz=timezone.utc).isoformat())
+    if "logged_at" not in event:
+        event["logged_at"] = now_iso()
     try:
         with DEVTOOLS_LOG.open("a", encoding="utf-8") as fh:
-            json.dump(entry, fh)
+            json.dump(event, fh)
             fh.write("\n")
     except OSError as exc:
         log_error(f"failed to append payload: {exc}")
@@ -82,9 +94,12 @@ def command_has_sleep(command: Union[str, Sequence[str], None]) -> bool:
     return False
 
 
-def maybe_emit_sleep_directive(event: Dict[str, Any]) -> None:
+def maybe_emit_sleep_directive(event: Dict[str, Any], raw: bytes) -> None:
     if event.get("phase") != "before_execution":
         return
+    # Nothing below can match unless "sleep" appears somewhere in the payload.
+    if b"sleep" not in raw.lower():
+        return
     call = event.get("call") or {}
     payload = call.get("payload") or {}
     tool_name = (call.get("tool_name") or "").lower()
@@ -120,9 +135,13 @@ def maybe_emit_sleep_directive(event: Dict[str, Any]) -> None:
 
 
 def main() -> None:
-    event = load_event()
+    raw = sys.stdin.buffer.read()
+    # Most tool events are neither DevTools calls nor pre-execution checks; skip parsing them.
+    if b'"mcp__chrome-devtools' not in raw and b'"before_execution"' not in raw:
+        return
+    event = load_event(raw)
     log_devtools(event)
-    maybe_emit_sleep_directive(event)
+    maybe_emit_sleep_directive(event, raw)
 
 
 if __name__ == "__main__":
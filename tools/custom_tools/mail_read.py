@@ -6,27 +6,27 @@ from __future__ import annotations
 import json
 import os
 import sys
-from pathlib import Path
-from typing import Any, Dict, Optional
+from html.parser import HTMLParser
+from typing import Any, Dict, List, Optional
 
-def _resolve_elise_core_root() -> Path:
-    env_root = os.environ.get("CODEX_ELISE_CORE_ROOT") or os.environ.get("ELISE_CORE_ROOT")
-    if env_root:
-        return Path(env_root).expanduser().resolve()
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
-    script_path = Path(__file__).resolve()
-    for parent in script_path.parents:
-        candidate = parent / "Elise" / "core"
-        if candidate.exists():
-            return candidate.resolve()
+from elise_paths import resolve_elise_core_root
 
-    raise SystemExit(
-        "Elise core repo not found. Set CODEX_ELISE_CORE_ROOT (or ELISE_CORE_ROOT) "
-        "to the absolute path of the Elise/core checkout."
-    )
 
+def _print_json(data: Any) -> None:
+    if orjson is None:
+        print(json.dumps(data, indent=2))
+        return
+    sys.stdout.flush()
+    sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2) + b"\n")
+    sys.stdout.buffer.flush()
 
-ELISE_CORE_ROOT = _resolve_elise_core_root()
+
+ELISE_CORE_ROOT = resolve_elise_core_root()
 if str(ELISE_CORE_ROOT) not in sys.path:
     sys.path.insert(0, str(ELISE_CORE_ROOT))
 
@@ -41,12 +41,13 @@ class MailClient(GraphEmailClient):
         response = self._request("GET", f"/me/messages/{message_id}", params=params)
         return response.json()
 
-    def find_by_internet_id(self, internet_id: str) -> Optional[Dict[str, Any]]:
-        params = {
+    def find_by_internet_id(self, internet_id: str, *, full: bool = False) -> Optional[Dict[str, Any]]:
+        params: Dict[str, Any] = {
             "$top": 1,
             "$filter": f"internetMessageId eq '{internet_id}'",
-            "$select": "id,subject,from,receivedDateTime,internetMessageId,isRead",
         }
+        if not full:
+            params["$select"] = "id,subject,from,receivedDateTime,internetMessageId,isRead"
         response = self._request("GET", "/me/messages", params=params)
         value = response.json().get("value", [])
         return value[0] if value else None
@@ -55,6 +56,31 @@ class MailClient(GraphEmailClient):
         self._request("PATCH", f"/me/messages/{message_id}", json={"isRead": True})
 
 
+class _HtmlToText(HTMLParser):
+    """Single-pass HTML -> text: drops tags, turns <br> into newlines, unescapes entities."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self._parts: List[str] = []
+
+    def handle_starttag(self, tag: str, attrs: Any) -> None:
+        if tag == "br":
+            self._parts.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        self._parts.append(data)
+
+    def text(self) -> str:
+        return "".join(self._parts)
+
+
+def html_to_text(content: str) -> str:
+    parser = _HtmlToText()
+    parser.feed(content)
+    parser.close()
+    return parser.text()
+
+
 def main() -> int:
     args_json = os.environ.get("CODEX_TOOL_ARGS_JSON")
     if not args_json:
@@ -77,15 +103,17 @@ def main() -> int:
 
     client = MailClient(save_to_sent=False)
 
-    if not message_id:
-        lookup = client.find_by_internet_id(internet_id)
-        if not lookup:
-            print("No message found for the supplied internet_message_id", file=sys.stderr)
-            return 1
-        message_id = lookup.get("id")
-
     try:
-        message = client.get_message(message_id, select=None)
+        if message_id:
+            message = client.get_message(message_id, select=None)
+        else:
+            # The lookup returns the full message (body included), so no second round-trip.
+            lookup = client.find_by_internet_id(internet_id, full=True)
+            if not lookup:
+                print("No message found for the supplied internet_message_id", file=sys.stderr)
+                return 1
+            message = lookup
+            message_id = lookup.get("id")
     except GraphApiError as exc:
         print(f"Graph API error: {exc}", file=sys.stderr)
         return 1
@@ -103,12 +131,7 @@ def main() -> int:
     content = body.get("content") or ""
     if not prefer_html and content_type == "html":
         # Basic HTML -> text fallback without additional dependencies.
-        import re
-        from html import unescape
-
-        text = re.sub(r"<\s*br\s*/?>", "\n", content, flags=re.IGNORECASE)
-        text = re.sub(r"<[^>]+>", "", text)
-        content_text = unescape(text)
+        content_text = html_to_text(content)
     else:
         content_text = content
 
@@ -124,7 +147,7 @@ def main() -> int:
         "body": content_text.strip(),
     }
 
-    print(json.dumps(output, indent=2))
+    _print_json(output)
     return 0
 
 
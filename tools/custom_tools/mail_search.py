@@ -7,27 +7,29 @@ import json
 import os
 import sys
 from datetime import datetime
-from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-def _resolve_elise_core_root() -> Path:
-    env_root = os.environ.get("CODEX_ELISE_CORE_ROOT") or os.environ.get("ELISE_CORE_ROOT")
-    if env_root:
-        return Path(env_root).expanduser().resolve()
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
-    script_path = Path(__file__).resolve()
-    for parent in script_path.parents:
-        candidate = parent / "Elise" / "core"
-        if candidate.exists():
-            return candidate.resolve()
+from elise_paths import resolve_elise_core_root
 
-    raise SystemExit(
-        "Elise core repo not found. Set CODEX_ELISE_CORE_ROOT (or ELISE_CORE_ROOT) "
-        "to the absolute path of the Elise/core checkout."
-    )
+# Python 3.11+ parses the trailing "Z" Graph uses for UTC natively.
+_FROMISOFORMAT_HANDLES_Z = sys.version_info >= (3, 11)
 
 
-ELISE_CORE_ROOT = _resolve_elise_core_root()
+def _print_json(data: Any) -> None:
+    if orjson is None:
+        print(json.dumps(data, indent=2))
+        return
+    sys.stdout.flush()
+    sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2) + b"\n")
+    sys.stdout.buffer.flush()
+
+
+ELISE_CORE_ROOT = resolve_elise_core_root()
 if str(ELISE_CORE_ROOT) not in sys.path:
     sys.path.insert(0, str(ELISE_CORE_ROOT))
 
@@ -132,7 +134,9 @@ def main() -> int:
         received = item.get("received")
         try:
             if received:
-                received = datetime.fromisoformat(received.replace("Z", "+00:00")).strftime("%Y-%m-%d %H:%M UTC")
+                if not _FROMISOFORMAT_HANDLES_Z:
+                    received = received.replace("Z", "+00:00")
+                received = datetime.fromisoformat(received).strftime("%Y-%m-%d %H:%M UTC")
         except ValueError:
             pass
         print(
@@ -145,7 +149,7 @@ def main() -> int:
         )
         print()
 
-    print(json.dumps({"results": results}, indent=2))
+    _print_json({"results": results})
     return 0
 
 
@@ -3,40 +3,25 @@
 
 from __future__ import annotations
 
+import atexit
 import json
 import os
 import sys
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import Iterable, List
-
-def _resolve_elise_core_root() -> Path:
-    env_root = os.environ.get("CODEX_ELISE_CORE_ROOT") or os.environ.get("ELISE_CORE_ROOT")
-    if env_root:
-        return Path(env_root).expanduser().resolve()
-
-    script_path = Path(__file__).resolve()
-    for parent in script_path.parents:
-        candidate = parent / "Elise" / "core"
-        if candidate.exists():
-            return candidate.resolve()
-
-    raise SystemExit(
-        "Elise core repo not found. Set CODEX_ELISE_CORE_ROOT (or ELISE_CORE_ROOT) "
-        "to the absolute path of the Elise/core checkout."
-    )
+from typing import Iterable, List, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
+from elise_outbox import ELISE_CORE_ROOT, OUTBOX_DIR, OUTBOX_LOG, record_send
 
-ELISE_CORE_ROOT = _resolve_elise_core_root()
 if str(ELISE_CORE_ROOT) not in sys.path:
     sys.path.insert(0, str(ELISE_CORE_ROOT))
 
 from standalone_mail_sender.graph_email import GraphApiError, GraphEmailClient
 
-OUTBOX_DIR = ELISE_CORE_ROOT / "logs"
-OUTBOX_INDEX = OUTBOX_DIR / "elise_outbox_index.json"
-OUTBOX_LOG = OUTBOX_DIR / "elise_outbox_log.jsonl"
-
 
 def _ensure_list(value: object, field: str) -> List[str]:
     if value is None:
@@ -56,25 +41,25 @@ def _ensure_list(value: object, field: str) -> List[str]:
     raise ValueError(f"{field} must be a string or list of strings")
 
 
-def _load_json(path: Path) -> dict:
-    if not path.exists():
-        return {}
-    try:
-        return json.loads(path.read_text())
-    except json.JSONDecodeError:
-        return {}
+_OUTBOX_FD: Optional[int] = None
 
 
-def _write_index(index: dict) -> None:
-    OUTBOX_DIR.mkdir(parents=True, exist_ok=True)
-    OUTBOX_INDEX.write_text(json.dumps(index, indent=2), encoding="utf-8")
+def _outbox_fd() -> int:
+    global _OUTBOX_FD
+    if _OUTBOX_FD is None:
+        OUTBOX_DIR.mkdir(parents=True, exist_ok=True)
+        _OUTBOX_FD = os.open(OUTBOX_LOG, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        atexit.register(os.close, _OUTBOX_FD)
+    return _OUTBOX_FD
 
 
 def _append_log(entry: dict) -> None:
-    OUTBOX_DIR.mkdir(parents=True, exist_ok=True)
-    with OUTBOX_LOG.open("a", encoding="utf-8") as handle:
-        json.dump(entry, handle)
-        handle.write("\n")
+    # One O_APPEND write per entry keeps concurrent senders from interleaving lines.
+    if orjson is not None:
+        line = orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+    else:
+        line = (json.dumps(entry, ensure_ascii=False) + "\n").encode("utf-8")
+    os.write(_outbox_fd(), line)
 
 
 def main() -> int:
@@ -146,11 +131,8 @@ def main() -> int:
         "wait_registered_at": None,
     }
 
-    index = _load_json(OUTBOX_INDEX)
-    if result.internet_message_id:
-        index[result.internet_message_id] = entry
-        _write_index(index)
     _append_log(entry)
+    record_send(entry)
 
     internet_id = result.internet_message_id or "unknown"
     summary = (
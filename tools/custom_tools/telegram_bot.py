@@ -5,82 +5,218 @@ from __future__ import annotations
 import argparse
 import asyncio
 import hashlib
+import html
 import json
 import os
 import re
+import socket
+import struct
 import sys
+import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Mapping
 from urllib import error as urllib_error
 from urllib import request as urllib_request
 
 try:
-    import structlog
-except ModuleNotFoundError:  # pragma: no cover - fallback for hook environments
-    import logging
+    import httpx
+except ModuleNotFoundError:  # pragma: no cover - hook environments may lack httpx
+    httpx = None
 
-    logging.basicConfig(level=logging.INFO)
+try:
+    import h2  # noqa: F401  (enables HTTP/2 in httpx)
+except ModuleNotFoundError:  # pragma: no cover
+    h2 = None
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - optional speedup
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers catch the latter.
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+class _FallbackLogger:  # pylint: disable=too-few-public-methods
+    def __init__(self, name: str):
+        import logging
+
+        logging.basicConfig(level=logging.INFO)
+        self._logger = logging.getLogger(name)
+
+    def info(self, msg: str, **kwargs: Any) -> None:
+        self._logger.info("%s %s", msg, kwargs if kwargs else "")
 
-    class _FallbackLogger:  # pylint: disable=too-few-public-methods
-        def __init__(self, name: str):
-            self._logger = logging.getLogger(name)
+    def warning(self, msg: str, **kwargs: Any) -> None:
+        self._logger.warning("%s %s", msg, kwargs if kwargs else "")
 
-        def info(self, msg: str, **kwargs: Any) -> None:
-            self._logger.info("%s %s", msg, kwargs if kwargs else "")
+    def error(self, msg: str, **kwargs: Any) -> None:
+        self._logger.error("%s %s", msg, kwargs if kwargs else "")
 
-        def warning(self, msg: str, **kwargs: Any) -> None:
-            self._logger.warning("%s %s", msg, kwargs if kwargs else "")
 
-        def error(self, msg: str, **kwargs: Any) -> None:
-            self._logger.error("%s %s", msg, kwargs if kwargs else "")
+class _LazyLogger:  # pylint: disable=too-few-public-methods
+    """Defer importing structlog until something is actually logged.
 
-    class _StructlogShim:
-        @staticmethod
-        def get_logger(name: str) -> _FallbackLogger:
-            return _FallbackLogger(name)
+    A stop hook that just hands its payload to the daemon never logs, so it skips the
+    structlog import tree entirely.
+    """
 
-    structlog = _StructlogShim()
+    def __init__(self, name: str):
+        self._name = name
+        self._logger: Any = None
 
-logger = structlog.get_logger(__name__)
+    def __getattr__(self, attr: str) -> Any:
+        if self._logger is None:
+            try:
+                import structlog
+            except ModuleNotFoundError:  # pragma: no cover - fallback for hook environments
+                self._logger = _FallbackLogger(self._name)
+            else:
+                self._logger = structlog.get_logger(self._name)
+        return getattr(self._logger, attr)
+
+
+logger = _LazyLogger(__name__)
 
 DEBUG_LOG = os.getenv("CODEX_STOP_HOOK_LOG")
+_UTC_SECONDS_FMT = "%Y-%m-%dT%H:%M:%SZ"
+DAEMON_SOCKET = os.getenv("CODEX_TELEGRAM_SOCKET", "/tmp/codex-telegram.sock")
+
+# Hook -> daemon frames: two 4-byte little-endian lengths, then the hook's environment
+# (a JSON object of _HOOK_ENV_KEYS) and the raw stop-hook JSON.
+_FRAME_HEADER = struct.Struct("<II")
+# Per-hook settings the daemon must apply per payload rather than read from its own env.
+_HOOK_ENV_KEYS = (
+    "CONTAINER_APP_JOB_EXECUTION_NAME",
+    "PITCHAI_JOB_EXECUTION_NAME",
+    "TELEGRAM_DEDUP_STATE_PATH",
+    "TELEGRAM_DEDUP_TTL_S",
+)
+_FRAME_ACK = b"\x01"
+_COALESCE_WINDOW_S = 0.25
+_TELEGRAM_TEXT_LIMIT = 4096
+_BATCH_SEPARATOR = "\n\n———\n\n"
+
+# (mtime_ns of the .env file, parsed values); re-parsed only when the file changes, which
+# matters for the long-running --daemon.
+_ENV_CACHE: tuple[int, dict[str, str]] | None = None
+# KEY=VALUE lines; comments and blank lines never match because the key may not start with
+# '#' or whitespace.
+_ENV_LINE_RE = re.compile(r"^[ \t]*([^#\s=][^=\n]*)=([^\n]*)$", re.MULTILINE)
+_UNSET: Any = object()
+_ENV_PATH: Any = _UNSET
+
+# Shared keep-alive client so several notifications from one process reuse the TLS session.
+_CLIENT: Any = None
+
+
+def _http_client() -> Any:
+    global _CLIENT
+    if _CLIENT is None:
+        _CLIENT = httpx.AsyncClient(
+            http2=h2 is not None,
+            timeout=15,
+            limits=httpx.Limits(max_keepalive_connections=4),
+        )
+    return _CLIENT
+
+
+async def aclose_http_client() -> None:
+    """Close the shared client; call before the event loop that used it shuts down."""
+    global _CLIENT
+    if _CLIENT is not None:
+        client, _CLIENT = _CLIENT, None
+        await client.aclose()
+
+
+class _TokenBucket:
+    """Async token bucket; Telegram allows roughly 30 messages/s per bot before 429s."""
 
-_ENV_CACHE: dict[str, str] | None = None
+    def __init__(self, rate: float, capacity: float):
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._stamp = time.monotonic()
+
+    async def take(self) -> None:
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._stamp) * self._rate)
+            self._stamp = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+_BUCKETS: dict[str, _TokenBucket] = {}
+_MAX_RATE_LIMIT_RETRIES = 3
+
+
+def _token_bucket(bot_token: str | None) -> _TokenBucket:
+    bucket = _BUCKETS.get(bot_token or "")
+    if bucket is None:
+        bucket = _BUCKETS[bot_token or ""] = _TokenBucket(rate=25, capacity=30)
+    return bucket
+
+
+def _retry_after_seconds(body: bytes, attempt: int) -> float:
+    """Delay before retrying a 429: Telegram's parameters.retry_after, else exponential."""
+    try:
+        retry_after = float(json.loads(body)["parameters"]["retry_after"])
+    except (ValueError, KeyError, TypeError):
+        retry_after = float(2**attempt)
+    return retry_after + 0.25
 
 
 def _find_env_file() -> Path | None:
     """Locate the nearest .env file walking up toward the project root."""
-    current = Path(__file__).resolve().parent
-    for directory in (current, *current.parents):
-        env_path = directory / ".env"
-        if env_path.exists():
-            return env_path
+    global _ENV_PATH
+    if _ENV_PATH is not _UNSET:
+        return _ENV_PATH
+
+    found: Path | None = None
+    directory = os.path.dirname(os.path.realpath(__file__))
+    while True:
+        env_path = os.path.join(directory, ".env")
+        if os.path.exists(env_path):
+            found = Path(env_path)
+            break
         # Stop at repository root (heuristic: contains .git)
-        if (directory / ".git").exists():
+        if os.path.exists(os.path.join(directory, ".git")):
             break
-    return None
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            break
+        directory = parent
+
+    _ENV_PATH = found
+    return found
 
 
 def _load_env_file() -> dict[str, str]:
     """Read Telegram-related variables from the repo's .env file if present."""
     global _ENV_CACHE
-    if _ENV_CACHE is not None:
-        return _ENV_CACHE
-
-    env_values: dict[str, str] = {}
     env_path = _find_env_file()
-    if env_path and env_path.exists():
-        for raw_line in env_path.read_text().splitlines():
-            line = raw_line.strip()
-            if not line or line.startswith("#") or "=" not in line:
-                continue
-            key, value = line.split("=", 1)
-            key = key.strip()
-            value = value.strip().strip('"\'')
-            env_values[key] = value
-
-    _ENV_CACHE = env_values
+    if env_path is None:
+        return {}
+    try:
+        mtime_ns = os.stat(env_path).st_mtime_ns
+    except OSError:
+        return {}
+    if _ENV_CACHE is not None and _ENV_CACHE[0] == mtime_ns:
+        return _ENV_CACHE[1]
+
+    try:
+        text = env_path.read_text()
+    except OSError:
+        text = ""
+    env_values = {
+        match.group(1).strip(): match.group(2).strip().strip('"\'')
+        for match in _ENV_LINE_RE.finditer(text)
+    }
+
+    _ENV_CACHE = (mtime_ns, env_values)
     return env_values
 
 
@@ -113,11 +249,24 @@ class TelegramNotifier:
             if self.bot_token
             else None
         )
+        self._payload_heads: dict[tuple[str, str], bytes] = {}
+        self._configured = bool(self.api_url and self.chat_id)
         if not self.bot_token:
             logger.warning("Telegram bot token not configured")
         else:
             logger.info("Telegram notifier ready")
 
+    def _payload_head(self, parse_mode: str, chat_id: str) -> bytes:
+        """Serialized sendMessage body up to the "text" value; only the text varies per call."""
+        head = self._payload_heads.get((chat_id, parse_mode))
+        if head is None:
+            head = (
+                f'{{"chat_id":{json.dumps(chat_id)},"parse_mode":{json.dumps(parse_mode)},'
+                '"disable_web_page_preview":true,"text":'
+            ).encode("utf-8")
+            self._payload_heads[(chat_id, parse_mode)] = head
+        return head
+
     async def send_daily_report(self, report: dict[str, Any]) -> bool:
         """Send daily monitoring report via Telegram.
 
@@ -250,17 +399,26 @@ class TelegramNotifier:
 
         return "\n".join(lines)
 
-    async def _send_message(self, message: str, priority: str = "normal") -> bool:
+    async def _send_message(
+        self,
+        message: str,
+        priority: str = "normal",
+        parse_mode: str = "Markdown",
+        chat_id: str | None = None,
+    ) -> bool:
         """Send message via Telegram.
 
         Args:
             message: Formatted message to send
             priority: Message priority (normal/high)
+            parse_mode: Telegram parse mode the message is formatted for (Markdown/HTML)
+            chat_id: Destination chat (defaults to the configured chat)
 
         Returns:
             True if sent successfully
         """
-        if not self._is_configured():
+        chat_id = chat_id or self.chat_id
+        if not (self.api_url and chat_id):
             logger.warning("Telegram not configured, skipping notification")
             return False
 
@@ -269,20 +427,8 @@ class TelegramNotifier:
             if priority == "high":
                 message = "‼️ " + message
 
-            payload = json.dumps(
-                {
-                    "chat_id": self.chat_id,
-                    "text": message,
-                    "parse_mode": "Markdown",
-                    "disable_web_page_preview": True,
-                }
-            ).encode("utf-8")
-
-            headers = {"Content-Type": "application/json"}
-            request = urllib_request.Request(self.api_url, data=payload, headers=headers)
-
-            loop = asyncio.get_running_loop()
-            await loop.run_in_executor(None, lambda: urllib_request.urlopen(request, timeout=15).read())
+            text = orjson.dumps(message) if orjson is not None else json.dumps(message).encode("utf-8")
+            await self._post(self._payload_head(parse_mode, chat_id) + text + b"}")
 
             logger.info("Telegram notification sent", priority=priority)
             return True
@@ -294,9 +440,34 @@ class TelegramNotifier:
             logger.error("Unexpected error sending Telegram notification", error=str(exc))
             return False
 
+    async def _post(self, payload: bytes) -> None:
+        """POST a sendMessage body, pacing with the per-token bucket and honouring 429s."""
+        headers = {"Content-Type": "application/json"}
+        bucket = _token_bucket(self.bot_token)
+        for attempt in range(_MAX_RATE_LIMIT_RETRIES + 1):
+            await bucket.take()
+            if httpx is not None:
+                response = await _http_client().post(self.api_url, content=payload, headers=headers)
+                if response.status_code == 429 and attempt < _MAX_RATE_LIMIT_RETRIES:
+                    await asyncio.sleep(_retry_after_seconds(response.content, attempt))
+                    continue
+                response.raise_for_status()
+                return
+
+            request = urllib_request.Request(self.api_url, data=payload, headers=headers)
+            loop = asyncio.get_running_loop()
+            try:
+                await loop.run_in_executor(None, lambda: urllib_request.urlopen(request, timeout=15).read())
+            except urllib_error.HTTPError as exc:
+                if exc.code == 429 and attempt < _MAX_RATE_LIMIT_RETRIES:
+                    await asyncio.sleep(_retry_after_seconds(exc.read(), attempt))
+                    continue
+                raise
+            return
+
     def _is_configured(self) -> bool:
         """Check if Telegram is properly configured."""
-        return bool(self.api_url and self.chat_id)
+        return self._configured
 
     async def test_connection(self) -> bool:
         """Test Telegram connection with a test message.
@@ -313,10 +484,47 @@ class TelegramNotifier:
 
         return await self._send_message(test_message)
 
-    async def send_plain_text(self, message: str, priority: str = "normal") -> bool:
-        """Send an arbitrary Markdown message."""
+    async def send_plain_text(
+        self, message: str, priority: str = "normal", parse_mode: str = "Markdown"
+    ) -> bool:
+        """Send an arbitrary message (Markdown unless another parse mode is given)."""
+
+        return await self._send_message(message, priority=priority, parse_mode=parse_mode)
+
+    async def send_to_many(
+        self, chat_ids: list[str], message: str, parse_mode: str = "Markdown"
+    ) -> list[bool]:
+        """Send one message to several chats concurrently over the shared client.
+
+        Returns one success flag per chat id, in order.
+        """
+        semaphore = asyncio.Semaphore(8)
+
+        async def _one(chat_id: str) -> bool:
+            async with semaphore:
+                return await self._send_message(message, parse_mode=parse_mode, chat_id=chat_id)
+
+        return list(await asyncio.gather(*(_one(chat_id) for chat_id in chat_ids)))
+
+
+_NOTIFIER: TelegramNotifier | None = None
+
+
+def get_notifier() -> TelegramNotifier:
+    """Return the process-wide notifier, rebuilt only if the configured token/chat change.
+
+    Keeps the notifier's pre-serialized payloads across stop-hook events in the daemon while
+    still following edits to .env (whose parse is cached on mtime).
+    """
+    global _NOTIFIER
+    bot_token = _get_env_value("TELEGRAM_BOT_TOKEN")
+    chat_id = _get_env_value("TELEGRAM_CHAT_ID")
+    if _NOTIFIER is None or (_NOTIFIER.bot_token, _NOTIFIER.chat_id) != (bot_token, chat_id):
+        _NOTIFIER = TelegramNotifier(bot_token, chat_id)
+    return _NOTIFIER
 
-        return await self._send_message(message, priority=priority)
+
+_STOP_HOOK_MESSAGE_LIMIT = 1500
 
 
 def _truncate(text: str, limit: int = 1500) -> str:
@@ -325,10 +533,13 @@ def _truncate(text: str, limit: int = 1500) -> str:
     return text[: limit - 1].rstrip() + "…"
 
 
+_STATUS_RE = re.compile(r"<status>(.*?)</status>", re.IGNORECASE | re.DOTALL)
+
+
 def _extract_status(text: str | None) -> str | None:
     if not text:
         return None
-    match = re.search(r"<status>(.*?)</status>", text, flags=re.IGNORECASE | re.DOTALL)
+    match = _STATUS_RE.search(text)
     if match:
         return match.group(1).strip().upper()
     return None
@@ -345,61 +556,70 @@ def _extract_last_assistant_message(response_items: list[dict[str, Any]] | None)
     return None
 
 
-def _escape_markdown(text: str) -> str:
-    # Telegram "Markdown" parse_mode is sensitive to unbalanced entities, so
-    # escape common special characters in arbitrary model output.
-    return (
-        text.replace("\\", "\\\\")
-        .replace("_", "\\_")
-        .replace("*", "\\*")
-        .replace("`", "\\`")
-        .replace("[", "\\[")
-    )
+def _basis_hash(text: str) -> str:
+    # Only an equality fingerprint for dedup, so a short blake2b digest is plenty.
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
 
 
-def _sha256_hex(text: str) -> str:
-    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+# Dedup state is one fixed-size record: 16-byte basis hash + little-endian epoch seconds.
+# Older JSON state files fail to unpack and are treated as "no previous send".
+_DEDUP_RECORD = struct.Struct("<16sq")
 
 
 def _read_dedup_state(path: Path) -> dict[str, Any]:
     try:
-        if not path.exists():
-            return {}
-        return json.loads(path.read_text(encoding="utf-8"))
-    except Exception:  # noqa: BLE001
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return {}
+    try:
+        raw = os.pread(fd, _DEDUP_RECORD.size + 1, 0)
+    except OSError:
+        return {}
+    finally:
+        os.close(fd)
+    if len(raw) != _DEDUP_RECORD.size:
         return {}
+    digest, epoch = _DEDUP_RECORD.unpack(raw)
+    return {"last_basis_hash": digest.hex(), "last_sent_epoch": epoch}
 
 
 def _write_dedup_state(path: Path, data: dict[str, Any]) -> None:
     try:
+        record = _DEDUP_RECORD.pack(bytes.fromhex(data["last_basis_hash"]), data["last_sent_epoch"])
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT, 0o644)
+        try:
+            # Overwrite in place, then drop any tail left by an older, longer state file.
+            os.pwrite(fd, record, 0)
+            os.ftruncate(fd, _DEDUP_RECORD.size)
+        finally:
+            os.close(fd)
     except Exception:  # noqa: BLE001
         return
 
 
 def _stop_hook_should_dedup_skip(
-    payload: dict[str, Any], formatted_message: str
+    payload: dict[str, Any], formatted_message: str, env: Mapping[str, str] = os.environ
 ) -> tuple[bool, str | None, Path | None]:
-    state_path_raw = os.getenv("TELEGRAM_DEDUP_STATE_PATH", "").strip()
+    state_path_raw = env.get("TELEGRAM_DEDUP_STATE_PATH", "").strip()
     if not state_path_raw:
         return (False, None, None)
 
-    ttl_s_raw = os.getenv("TELEGRAM_DEDUP_TTL_S", "").strip()
+    ttl_s_raw = env.get("TELEGRAM_DEDUP_TTL_S", "").strip()
     ttl_s = int(ttl_s_raw) if ttl_s_raw else 86400
     if ttl_s <= 0:
         return (False, None, Path(state_path_raw))
 
     state_path = Path(state_path_raw).expanduser()
     state = _read_dedup_state(state_path)
-    now_epoch = int(datetime.now(timezone.utc).timestamp())
+    now_epoch = int(time.time())
 
     basis = payload.get("final_message") or _extract_last_assistant_message(payload.get("response_items"))
     if not isinstance(basis, str) or not basis.strip():
         basis = formatted_message
-    basis_hash = _sha256_hex(basis.strip())
+    basis_hash = _basis_hash(basis.strip())
 
-    last_hash = state.get("last_basis_sha256")
+    last_hash = state.get("last_basis_hash")
     last_sent_epoch = state.get("last_sent_epoch")
     if isinstance(last_hash, str) and isinstance(last_sent_epoch, int):
         if last_hash == basis_hash and (now_epoch - last_sent_epoch) < ttl_s:
@@ -407,14 +627,15 @@ def _stop_hook_should_dedup_skip(
 
     return (False, basis_hash, state_path)
 
-def _format_stop_hook_message(payload: dict[str, Any]) -> str:
+def _format_stop_hook_message(payload: dict[str, Any], env: Mapping[str, str] = os.environ) -> str:
     cwd = payload.get("cwd", "(unknown cwd)")
     final_message = payload.get("final_message") or _extract_last_assistant_message(
         payload.get("response_items")
     )
     final_message = final_message or "(No final assistant message recorded.)"
-    final_message = final_message.strip()
-    final_message = _truncate(final_message, 1500)
+    # Cut very long outputs before strip() so it does not copy tens of KB only to discard them.
+    final_message = final_message[: _STOP_HOOK_MESSAGE_LIMIT * 2].strip()
+    final_message = _truncate(final_message, _STOP_HOOK_MESSAGE_LIMIT)
 
     project_name = cwd
     try:
@@ -422,8 +643,8 @@ def _format_stop_hook_message(payload: dict[str, Any]) -> str:
     except Exception:  # noqa: BLE001
         project_name = Path(cwd).name or cwd
 
-    utc = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
-    execution_name = os.getenv("CONTAINER_APP_JOB_EXECUTION_NAME") or os.getenv("PITCHAI_JOB_EXECUTION_NAME")
+    utc = time.strftime(_UTC_SECONDS_FMT, time.gmtime())
+    execution_name = env.get("CONTAINER_APP_JOB_EXECUTION_NAME") or env.get("PITCHAI_JOB_EXECUTION_NAME")
     conversation_id = payload.get("conversation_id")
 
     meta_parts = [utc]
@@ -433,35 +654,65 @@ def _format_stop_hook_message(payload: dict[str, Any]) -> str:
         meta_parts.append(f"convo={conversation_id.strip()[:10]}")
     meta = " | ".join(meta_parts)
 
-    project_name = _escape_markdown(project_name)
-    meta = _escape_markdown(meta)
-    final_message = _escape_markdown(final_message)
-    return f"*{project_name}* _{meta}_\n{final_message}"
+    # Sent with parse_mode=HTML: html.escape is a single pass and model output needs no
+    # Markdown-entity escaping.
+    return (
+        f"<b>{html.escape(project_name, quote=False)}</b> <i>{html.escape(meta, quote=False)}</i>\n"
+        f"{html.escape(final_message, quote=False)}"
+    )
+
+
+def _debug_log_entry(payload: dict[str, Any], message: str) -> str:
+    return (
+        f"{time.strftime(_UTC_SECONDS_FMT, time.gmtime())} | convo={payload.get('conversation_id')} | cwd={payload.get('cwd')}\n"
+        f"{message}\n\n"
+    )
 
 
-def _append_debug_log(payload: dict[str, Any], message: str) -> None:
-    if not DEBUG_LOG:
+def _append_debug_log(entries: list[str]) -> None:
+    if not DEBUG_LOG or not entries:
         return
     try:
         path = Path(DEBUG_LOG).expanduser()
         path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("a", encoding="utf-8") as fh:
-            fh.write(
-                f"{datetime.now(timezone.utc).isoformat()} | convo={payload.get('conversation_id')} | cwd={payload.get('cwd')}\n"
-            )
-            fh.write(message + "\n\n")
+        # One O_APPEND write per call, however many entries it carries.
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, "".join(entries).encode("utf-8"))
+        finally:
+            os.close(fd)
     except Exception as exc:  # noqa: BLE001
         logger.warning("Failed to append debug log", error=str(exc))
 
 
+def _prepare_stop_hook_message(payload: dict[str, Any], env: Mapping[str, str] = os.environ) -> str:
+    # Codex normally sends final_message; when it does not, scan response_items once here
+    # instead of separately in the formatter and the dedup check.
+    if not payload.get("final_message"):
+        extracted = _extract_last_assistant_message(payload.get("response_items"))
+        if extracted:
+            payload["final_message"] = extracted
+
+    return _format_stop_hook_message(payload, env)
+
+
+def _remember_sent(basis_hash: str | None, state_path: Path | None) -> None:
+    if state_path and basis_hash:
+        _write_dedup_state(
+            state_path,
+            {"last_basis_hash": basis_hash, "last_sent_epoch": int(time.time())},
+        )
+
+
 async def handle_stop_hook_event(payload: dict[str, Any], *, dry_run: bool = False) -> bool:
-    message = _format_stop_hook_message(payload)
-    _append_debug_log(payload, message)
+    message = _prepare_stop_hook_message(payload)
+    if DEBUG_LOG:
+        _append_debug_log([_debug_log_entry(payload, message)])
     if dry_run:
         print(message)
         return True
 
-    notifier = TelegramNotifier()
+    notifier = get_notifier()
     if not notifier._is_configured():  # noqa: SLF001
         logger.warning("Telegram credentials missing; skipping stop-hook notification")
         return False
@@ -480,15 +731,145 @@ async def handle_stop_hook_event(payload: dict[str, Any], *, dry_run: bool = Fal
         conversation_id=payload.get("conversation_id"),
         cwd=payload.get("cwd"),
     )
-    sent = await notifier.send_plain_text(message)
-    if sent and state_path and basis_hash:
-        _write_dedup_state(
-            state_path,
-            {"last_basis_sha256": basis_hash, "last_sent_epoch": int(datetime.now(timezone.utc).timestamp())},
-        )
+    sent = await notifier.send_plain_text(message, parse_mode="HTML")
+    if sent:
+        _remember_sent(basis_hash, state_path)
     return sent
 
 
+async def _handle_stop_hook_batch(events: list[tuple[dict[str, Any], Mapping[str, str]]]) -> None:
+    """Send several stop-hook events as few Telegram messages as the size limit allows.
+
+    Each event carries the environment of the hook that produced it, which decides its
+    execution label and dedup state file.
+    """
+    notifier = get_notifier()
+    if not notifier._is_configured():  # noqa: SLF001
+        logger.warning("Telegram credentials missing; skipping stop-hook notification")
+        return
+
+    messages: list[str] = []
+    debug_entries: list[str] = []
+    seen: set[tuple[Path | None, str]] = set()
+    # Last sent hash per dedup state file; hooks with different state files dedup separately.
+    last_hashes: dict[Path, str] = {}
+    for payload, env in events:
+        message = _prepare_stop_hook_message(payload, env)
+        if DEBUG_LOG:
+            debug_entries.append(_debug_log_entry(payload, message))
+        should_skip, basis_hash, state_path = _stop_hook_should_dedup_skip(payload, message, env)
+        if should_skip or (basis_hash is not None and (state_path, basis_hash) in seen):
+            continue
+        if basis_hash is not None:
+            seen.add((state_path, basis_hash))
+            if state_path is not None:
+                last_hashes[state_path] = basis_hash
+        messages.append(message)
+
+    # Keep the event loop free while the batch's debug entries go out in one write.
+    if debug_entries:
+        await asyncio.to_thread(_append_debug_log, debug_entries)
+
+    # Pack whole messages (never split one, so HTML tags stay balanced) under the API limit.
+    chunks: list[str] = []
+    for message in messages:
+        if chunks and len(chunks[-1]) + len(_BATCH_SEPARATOR) + len(message) <= _TELEGRAM_TEXT_LIMIT:
+            chunks[-1] += _BATCH_SEPARATOR + message
+        else:
+            chunks.append(message)
+
+    logger.info("Sending stop-hook telegram notifications", events=len(messages), requests=len(chunks))
+    sent = True
+    for chunk in chunks:
+        sent = await notifier.send_plain_text(chunk, parse_mode="HTML") and sent
+    if messages and sent:
+        for state_path, last_hash in last_hashes.items():
+            _remember_sent(last_hash, state_path)
+
+
+def _forward_to_daemon(raw: bytes) -> bool:
+    """Hand a raw stop-hook payload to a running ``--daemon`` process.
+
+    Returns False (and the caller sends directly) when no daemon is listening. Once the
+    whole frame is written the payload counts as handed over, even if the ACK is late:
+    falling back then could deliver the message twice.
+    """
+    hook_env = {key: os.environ[key] for key in _HOOK_ENV_KEYS if key in os.environ}
+    if hook_env.get("TELEGRAM_DEDUP_STATE_PATH", "").strip():
+        # Resolve against the hook's home and cwd, not the daemon's.
+        state_path = os.path.expanduser(hook_env["TELEGRAM_DEDUP_STATE_PATH"].strip())
+        hook_env["TELEGRAM_DEDUP_STATE_PATH"] = os.path.abspath(state_path)
+    env_raw = json.dumps(hook_env).encode("utf-8")
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(1.0)
+            sock.connect(DAEMON_SOCKET)
+            sock.sendall(_FRAME_HEADER.pack(len(env_raw), len(raw)) + env_raw + raw)
+            try:
+                if sock.recv(1) != _FRAME_ACK:
+                    logger.warning("Stop-hook daemon closed without acknowledging the payload")
+            except OSError:
+                pass
+            return True
+    except OSError:
+        return False
+
+
+async def run_daemon(socket_path: str = DAEMON_SOCKET) -> None:
+    """Accept stop-hook payloads on a Unix socket and send them over one keep-alive client.
+
+    Hooks only enqueue and return; a single worker drains the queue so dedup state and
+    the Telegram connection are handled in one long-lived process. Payloads arriving
+    within ``_COALESCE_WINDOW_S`` of each other are sent together.
+    """
+    queue: asyncio.Queue[tuple[bytes, bytes]] = asyncio.Queue()
+
+    async def _accept(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            env_length, length = _FRAME_HEADER.unpack(await reader.readexactly(_FRAME_HEADER.size))
+            env_raw = await reader.readexactly(env_length)
+            queue.put_nowait((env_raw, await reader.readexactly(length)))
+            writer.write(_FRAME_ACK)
+            await writer.drain()
+        except (asyncio.IncompleteReadError, OSError) as exc:
+            logger.warning("Dropped malformed stop-hook frame", error=str(exc))
+        finally:
+            writer.close()
+
+    async def _drain() -> None:
+        while True:
+            batch = [await queue.get()]
+            # Give a burst of hooks a moment to arrive so they share one sendMessage call.
+            await asyncio.sleep(_COALESCE_WINDOW_S)
+            while not queue.empty():
+                batch.append(queue.get_nowait())
+            events = []
+            for env_raw, raw in batch:
+                try:
+                    events.append((_json_loads(raw), _json_loads(env_raw)))
+                except json.JSONDecodeError as exc:
+                    logger.error("Failed to parse stop-hook payload", error=str(exc))
+            try:
+                await _handle_stop_hook_batch(events)
+            except Exception as exc:  # noqa: BLE001
+                logger.error("Unexpected error while handling stop hook", error=str(exc))
+
+    try:
+        os.unlink(socket_path)
+    except FileNotFoundError:
+        pass
+    server = await asyncio.start_unix_server(_accept, path=socket_path)
+    os.chmod(socket_path, 0o600)
+    logger.info("Telegram stop-hook daemon listening", socket=socket_path)
+    worker = asyncio.create_task(_drain())
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        worker.cancel()
+        await aclose_http_client()
+
+
 def _parse_args(argv: list[str]) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Telegram helpers for Codex hooks")
     parser.add_argument(
@@ -496,6 +877,11 @@ def _parse_args(argv: list[str]) -> argparse.Namespace:
         action="store_true",
         help="Read a stop-hook payload from stdin and forward it to Telegram",
     )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Listen on CODEX_TELEGRAM_SOCKET and send stop-hook payloads forwarded by hooks",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -507,18 +893,35 @@ def _parse_args(argv: list[str]) -> argparse.Namespace:
 def main(argv: list[str] | None = None) -> int:
     args = _parse_args(argv or sys.argv[1:])
 
+    if args.daemon:
+        try:
+            asyncio.run(run_daemon())
+        except KeyboardInterrupt:
+            pass
+        return 0
+
     if not args.stop_hook:
         logger.error("No mode selected; pass --stop-hook when used as a Codex hook")
         return 1
 
+    raw = sys.stdin.buffer.read()
+    if not args.dry_run and _forward_to_daemon(raw):
+        return 0
+
     try:
-        payload = json.load(sys.stdin)
+        payload = _json_loads(raw)
     except json.JSONDecodeError as exc:  # noqa: BLE001
         logger.error("Failed to parse stop-hook payload", error=str(exc))
         return 1
 
+    async def _run() -> None:
+        try:
+            await handle_stop_hook_event(payload, dry_run=args.dry_run)
+        finally:
+            await aclose_http_client()
+
     try:
-        asyncio.run(handle_stop_hook_event(payload, dry_run=args.dry_run))
+        asyncio.run(_run())
     except Exception as exc:  # noqa: BLE001
         logger.error("Unexpected error while handling stop hook", error=str(exc))
         return 1
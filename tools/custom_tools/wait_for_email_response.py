@@ -7,43 +7,16 @@ import json
 import os
 import sys
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import Dict, List
+from typing import List
 
-def _resolve_elise_core_root() -> Path:
-    env_root = os.environ.get("CODEX_ELISE_CORE_ROOT") or os.environ.get("ELISE_CORE_ROOT")
-    if env_root:
-        return Path(env_root).expanduser().resolve()
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
-    script_path = Path(__file__).resolve()
-    for parent in script_path.parents:
-        candidate = parent / "Elise" / "core"
-        if candidate.exists():
-            return candidate.resolve()
+from elise_outbox import rebuild_index_if_stale, save_index
 
-    raise SystemExit(
-        "Elise core repo not found. Set CODEX_ELISE_CORE_ROOT (or ELISE_CORE_ROOT) "
-        "to the absolute path of the Elise/core checkout."
-    )
-
-
-ELISE_CORE_ROOT = _resolve_elise_core_root()
-OUTBOX_DIR = ELISE_CORE_ROOT / "logs"
-OUTBOX_INDEX = OUTBOX_DIR / "elise_outbox_index.json"
-
-
-def load_index() -> Dict[str, dict]:
-    if not OUTBOX_INDEX.exists():
-        return {}
-    try:
-        return json.loads(OUTBOX_INDEX.read_text())
-    except json.JSONDecodeError:
-        return {}
-
-
-def save_index(index: Dict[str, dict]) -> None:
-    OUTBOX_DIR.mkdir(parents=True, exist_ok=True)
-    OUTBOX_INDEX.write_text(json.dumps(index, indent=2), encoding="utf-8")
+_loads = orjson.loads if orjson is not None else json.loads
 
 
 def normalize_ids(payload: dict) -> List[str]:
@@ -62,7 +35,7 @@ def main() -> int:
         print("CODEX_TOOL_ARGS_JSON missing", file=sys.stderr)
         return 1
     try:
-        payload = json.loads(args_json)
+        payload = _loads(args_json)
     except json.JSONDecodeError as exc:
         print(f"Invalid JSON: {exc}", file=sys.stderr)
         return 1
@@ -72,7 +45,7 @@ def main() -> int:
         print("Provide at least one message_id or message_ids entry", file=sys.stderr)
         return 1
 
-    index = load_index()
+    index = rebuild_index_if_stale()
     timestamp = datetime.now(timezone.utc).isoformat()
     convo_id = os.environ.get("CODEX_CONVERSATION_ID")
     turn_id = os.environ.get("CODEX_TURN_ID")
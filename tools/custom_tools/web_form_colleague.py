@@ -10,24 +10,9 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict
 
-def _resolve_elise_core_root() -> Path:
-    env_root = os.environ.get("CODEX_ELISE_CORE_ROOT") or os.environ.get("ELISE_CORE_ROOT")
-    if env_root:
-        return Path(env_root).expanduser().resolve()
-
-    script_path = Path(__file__).resolve()
-    for parent in script_path.parents:
-        candidate = parent / "Elise" / "core"
-        if candidate.exists():
-            return candidate.resolve()
-
-    raise SystemExit(
-        "Elise core repo not found. Set CODEX_ELISE_CORE_ROOT (or ELISE_CORE_ROOT) "
-        "to the absolute path of the Elise/core checkout."
-    )
-
+from elise_paths import resolve_elise_core_root
 
-ELISE_CORE_ROOT = _resolve_elise_core_root()
+ELISE_CORE_ROOT = resolve_elise_core_root()
 LOG_DIR = ELISE_CORE_ROOT / "logs"
 TASK_INDEX = LOG_DIR / "elise_web_tasks.json"
 TASK_LOG = LOG_DIR / "elise_web_tasks_log.jsonl"
@@ -4,12 +4,12 @@ from pathlib import Path
 from typing import Optional
 
 from fastapi import FastAPI, HTTPException, Request
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
 from .config import get_config
-from .parser import parse_session
+from .parser import parse_session_cached
 from .search import find_rollout_by_conversation_id, list_recent_sessions
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -21,10 +21,24 @@ app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 templates = Jinja2Templates(directory=TEMPLATES_DIR)
 
 
+# conversation id -> rollout path. Rollout files keep their path once written, so a hit only
+# needs one stat to confirm the file is still there (it moves when a session is archived).
+# Misses are not cached, so a newly started conversation is found on the next request.
+_ROLLOUT_PATHS: dict[str, Path] = {}
+_ROLLOUT_PATHS_MAX = 256
+
+
 def _ensure_file(conversation_id: str) -> Path:
+    path = _ROLLOUT_PATHS.get(conversation_id)
+    if path is not None and path.is_file():
+        return path
     path = find_rollout_by_conversation_id(conversation_id)
     if not path:
+        _ROLLOUT_PATHS.pop(conversation_id, None)
         raise HTTPException(status_code=404, detail=f"Conversation {conversation_id} not found")
+    if conversation_id not in _ROLLOUT_PATHS and len(_ROLLOUT_PATHS) >= _ROLLOUT_PATHS_MAX:
+        _ROLLOUT_PATHS.pop(next(iter(_ROLLOUT_PATHS)))
+    _ROLLOUT_PATHS[conversation_id] = path
     return path
 
 
@@ -35,7 +49,7 @@ async def home(request: Request, conversation_id: Optional[str] = None):
     if conversation_id:
         try:
             path = _ensure_file(conversation_id)
-            session = parse_session(path)
+            session = parse_session_cached(path)
             redirect = session.meta.conversation_id
         except HTTPException:
             message = f"Conversation {conversation_id} not found"
@@ -56,7 +70,8 @@ async def home(request: Request, conversation_id: Optional[str] = None):
 @app.get("/conversations/{conversation_id}", response_class=HTMLResponse)
 async def conversation(request: Request, conversation_id: str):
     path = _ensure_file(conversation_id)
-    session = parse_session(path)
+    # The template never shows hidden cards, so don't build them.
+    session = parse_session_cached(path, include_hidden=False)
     return templates.TemplateResponse(
         "conversation.html",
         {
@@ -70,11 +85,13 @@ async def conversation(request: Request, conversation_id: str):
 @app.get("/api/conversations/{conversation_id}")
 async def conversation_api(conversation_id: str):
     path = _ensure_file(conversation_id)
-    session = parse_session(path)
-    return session
+    session = parse_session_cached(path)
+    # pydantic-core serializes straight to JSON bytes; returning the model would go through
+    # jsonable_encoder and the stdlib encoder card by card.
+    return Response(content=session.model_dump_json(), media_type="application/json")
 
 
 @app.get("/health")
 async def health_check():
     cfg = get_config()
-    return {"status": "ok", "codex_home": str(cfg.codex_home), "sessions_dir": cfg.sessions_dir.exists()}
+    return {"status": "ok", "codex_home": str(cfg.codex_home), "sessions_dir": cfg.exists}
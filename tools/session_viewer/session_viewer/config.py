@@ -1,10 +1,15 @@
 from __future__ import annotations
 
 import os
+import time
 from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Optional, Tuple
+
+# sessions_dir -> (expires_at, exists); /health probes often and stat can be slow on network mounts.
+_EXISTS_TTL_SECONDS = 5.0
+_exists_cache: Dict[Path, Tuple[float, bool]] = {}
 
 
 @dataclass(frozen=True)
@@ -15,7 +20,13 @@ class SessionViewerConfig:
 
     @property
     def exists(self) -> bool:
-        return self.sessions_dir.exists()
+        now = time.monotonic()
+        cached = _exists_cache.get(self.sessions_dir)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+        value = self.sessions_dir.exists()
+        _exists_cache[self.sessions_dir] = (now + _EXISTS_TTL_SECONDS, value)
+        return value
 
 
 @lru_cache(maxsize=1)
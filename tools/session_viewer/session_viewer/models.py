@@ -2,10 +2,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime
+from functools import cached_property
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, computed_field
 
 
 class SessionMeta(BaseModel):
@@ -26,7 +27,7 @@ class TimelineCard(BaseModel):
     title: str
     subtitle: Optional[str] = None
     body: Optional[str] = None
-    body_html: Optional[str] = None
+    body_markdown: Optional[str] = Field(default=None, exclude=True)
     code: Optional[str] = None
     level: str = "info"
     icon: str = "📝"
@@ -34,7 +35,17 @@ class TimelineCard(BaseModel):
     presentation: str = "summary-collapsed"  # full, summary-collapsed, summary-open, hidden
     raw: Dict[str, Any]
 
-    @property
+    # Rendered on first access, so hidden cards the timeline never shows skip Markdown. Collapsed
+    # cards are still rendered server-side, and the JSON dump renders every card.
+    @computed_field
+    @cached_property
+    def body_html(self) -> Optional[str]:
+        from .summary import _render_markdown
+
+        return _render_markdown(self.body_markdown)
+
+    # Cached per card (parsed sessions are reused across requests); not part of the JSON dump.
+    @cached_property
     def delta_human(self) -> str:
         if self.delta_seconds is None:
             return "—"
@@ -1,33 +1,60 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime
+import os
+import sys
+from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterator, Optional
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
 from .models import RawEvent, SessionMeta, SessionView
 from . import summary
 
+_loads = orjson.loads if orjson is not None else json.loads
+_UTC = timezone.utc
+
 
+@lru_cache(maxsize=4096)
 def _parse_timestamp(value: str) -> datetime:
-    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    # Rollouts stamp many events within the same instant, so identical strings repeat often.
+    if value[-1] == "Z":
+        return datetime.fromisoformat(value[:-1]).replace(tzinfo=_UTC)
+    return datetime.fromisoformat(value)
 
 
 def iter_raw_events(path: Path) -> Iterator[RawEvent]:
-    with path.open("r", encoding="utf-8") as fh:
+    fallback_ts: Optional[datetime] = None
+    # Bytes in, bytes to the JSON parser: no per-line UTF-8 decode into str first.
+    with path.open("rb") as fh:
         for line in fh:
             line = line.strip()
             if not line:
                 continue
             try:
-                data = json.loads(line)
-            except json.JSONDecodeError:
+                data = _loads(line)
+            except ValueError:
                 continue
-            timestamp = _parse_timestamp(data.get("timestamp")) if data.get("timestamp") else datetime.fromtimestamp(path.stat().st_mtime)
-            yield RawEvent(timestamp=timestamp, type=data.get("type", "unknown"), payload=data.get("payload") or {}, raw=data)
+            if data.get("timestamp"):
+                timestamp = _parse_timestamp(data["timestamp"])
+            else:
+                if fallback_ts is None:
+                    fallback_ts = datetime.fromtimestamp(os.fstat(fh.fileno()).st_mtime)
+                timestamp = fallback_ts
+            # A handful of event types repeat on every line; intern them so the cards share one
+            # string per type and builder lookups hit on identity.
+            event_type = data.get("type", "unknown")
+            if isinstance(event_type, str):
+                event_type = sys.intern(event_type)
+            yield RawEvent(timestamp=timestamp, type=event_type, payload=data.get("payload") or {}, raw=data)
 
 
-def parse_session(path: Path) -> SessionView:
+def parse_session(path: Path, *, include_hidden: bool = True) -> SessionView:
     meta: Optional[SessionMeta] = None
     cards = []
     prev_ts: Optional[datetime] = None
@@ -47,7 +74,7 @@ def parse_session(path: Path) -> SessionView:
             continue
         delta = (event.timestamp - prev_ts).total_seconds() if prev_ts else None
         prev_ts = event.timestamp
-        card = summary.to_card(event, delta)
+        card = summary.to_card(event, delta, include_hidden=include_hidden)
         if card:
             cards.append(card)
     if meta is None:
@@ -62,3 +89,17 @@ def parse_session(path: Path) -> SessionView:
             file_path=path,
         )
     return SessionView(meta=meta, cards=cards)
+
+
+@lru_cache(maxsize=32)
+def _parse_session_version(path_str: str, mtime_ns: int, size: int, include_hidden: bool) -> SessionView:
+    return parse_session(Path(path_str), include_hidden=include_hidden)
+
+
+def parse_session_cached(path: Path, *, include_hidden: bool = True) -> SessionView:
+    """Like parse_session, but reuse the result while the rollout's mtime and size are unchanged.
+
+    The returned view is shared between callers and must not be mutated.
+    """
+    st = path.stat()
+    return _parse_session_version(str(path), st.st_mtime_ns, st.st_size, include_hidden)
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 from .config import get_config
 
@@ -11,21 +18,49 @@ ROLL_OUT_PREFIX = "rollout-"
 ROLL_OUT_SUFFIX = ".jsonl"
 
 
-def iter_rollout_files(include_archived: bool = True) -> Iterable[Path]:
+def _walk_rollouts(root: str) -> Iterator[os.DirEntry]:
+    # Plain scandir recursion: d_type tells files from directories without a stat, no Path
+    # is built per entry, and (like rglob) symlinked directories are not descended into.
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from _walk_rollouts(entry.path)
+                elif (
+                    entry.name.startswith(ROLL_OUT_PREFIX)
+                    and entry.name.endswith(ROLL_OUT_SUFFIX)
+                    and entry.is_file()
+                ):
+                    yield entry
+            except OSError:
+                continue
+
+
+def iter_rollout_entries(include_archived: bool = True) -> Iterator[os.DirEntry]:
     cfg = get_config()
-    if cfg.sessions_dir.exists():
-        yield from cfg.sessions_dir.rglob(f"{ROLL_OUT_PREFIX}*{ROLL_OUT_SUFFIX}")
-    if include_archived and cfg.archived_sessions_dir and cfg.archived_sessions_dir.exists():
-        yield from cfg.archived_sessions_dir.rglob(f"{ROLL_OUT_PREFIX}*{ROLL_OUT_SUFFIX}")
+    yield from _walk_rollouts(str(cfg.sessions_dir))
+    if include_archived and cfg.archived_sessions_dir:
+        yield from _walk_rollouts(str(cfg.archived_sessions_dir))
+
+
+def iter_rollout_files(include_archived: bool = True) -> Iterable[Path]:
+    for entry in iter_rollout_entries(include_archived):
+        yield Path(entry.path)
 
 
 def _conversation_id_from_file(path: Path) -> Optional[str]:
     try:
-        with path.open("r", encoding="utf-8") as fh:
+        # Binary readline: no text wrapper or decoder, and it reads past the first buffer only
+        # when session_meta is long (it embeds the full instructions).
+        with open(path, "rb") as fh:
             first_line = fh.readline().strip()
             if not first_line:
                 return None
-            data = json.loads(first_line)
+            data = orjson.loads(first_line) if orjson is not None else json.loads(first_line)
             if data.get("type") == "session_meta":
                 payload = data.get("payload") or {}
                 return payload.get("id")
@@ -34,44 +69,82 @@ def _conversation_id_from_file(path: Path) -> Optional[str]:
     return None
 
 
+# (path, mtime) -> conversation id, so repeated listings only open new or rewritten files.
+_CONVERSATION_IDS: Dict[Tuple[Path, float], Optional[str]] = {}
+_CONVERSATION_IDS_MAX = 2048
+
+
+def _cached_conversation_id(entry: os.DirEntry) -> Optional[str]:
+    path = Path(entry.path)
+    try:
+        key = (path, entry.stat().st_mtime)
+    except OSError:
+        return None
+    if key not in _CONVERSATION_IDS:
+        if len(_CONVERSATION_IDS) >= _CONVERSATION_IDS_MAX:
+            _CONVERSATION_IDS.clear()
+        _CONVERSATION_IDS[key] = _conversation_id_from_file(path)
+    return _CONVERSATION_IDS[key]
+
+
 def find_rollout_by_conversation_id(conversation_id: str) -> Optional[Path]:
     needle = conversation_id.lower()
-    # Fast path: filename substring search
-    candidates: List[Path] = []
-    for path in iter_rollout_files():
-        name = path.name.lower()
-        if needle in name:
-            candidates.append(path)
+    # One walk of the tree: filename matches are the fast path, the rest is kept for the
+    # fallback instead of walking the tree a second time.
+    candidates: List[os.DirEntry] = []
+    others: List[os.DirEntry] = []
+    for entry in iter_rollout_entries():
+        if needle in entry.name.lower():
+            candidates.append(entry)
+        elif not candidates:
+            others.append(entry)
     if not candidates:
-        # fallback to full scan: maybe user provided short prefix; attempt to match by reading files
-        candidates = list(iter_rollout_files())
-    for path in candidates:
-        cid = _conversation_id_from_file(path)
+        # fallback to full scan: maybe user provided short prefix; attempt to match by reading
+        # files (first lines are remembered per (path, mtime), so repeat scans only stat)
+        candidates = others
+    for entry in candidates:
+        cid = _cached_conversation_id(entry)
         if cid and cid.lower().startswith(needle):
-            return path
+            return Path(entry.path)
     return None
 
 
 def list_recent_sessions(limit: int = 25) -> List[dict]:
     files = []
-    for path in iter_rollout_files():
+    for entry in iter_rollout_entries():
         try:
-            stat = path.stat()
+            mtime = entry.stat().st_mtime
         except FileNotFoundError:
             continue
-        files.append((stat.st_mtime, path))
+        files.append((mtime, entry.path))
     files.sort(reverse=True)
+    top = [(mtime, Path(path)) for mtime, path in files[:limit]]
     rows: List[dict] = []
     cfg = get_config()
-    for mtime, path in files[:limit]:
-        cid = _conversation_id_from_file(path)
+    home_prefix = os.path.join(str(cfg.codex_home), "")
+    # Only the newest `limit` files are opened, and only when not already known; their
+    # first-line reads overlap on a small thread pool.
+    misses = [(path, mtime) for mtime, path in top if (path, mtime) not in _CONVERSATION_IDS]
+    if misses:
+        if len(_CONVERSATION_IDS) + len(misses) > _CONVERSATION_IDS_MAX:
+            _CONVERSATION_IDS.clear()
+        with ThreadPoolExecutor(max_workers=min(32, len(misses))) as pool:
+            cids = pool.map(_conversation_id_from_file, [path for path, _ in misses])
+            _CONVERSATION_IDS.update(zip(misses, cids))
+    for mtime, path in top:
+        cid = _CONVERSATION_IDS.get((path, mtime))
+        parent = os.path.dirname(str(path))
+        if parent.startswith(home_prefix):
+            relative_dir = parent[len(home_prefix):]
+        else:
+            relative_dir = str(path.parent.relative_to(cfg.codex_home))
         rows.append(
             {
                 "conversation_id": cid,
                 "filename": path.name,
                 "path": path,
                 "timestamp": datetime.fromtimestamp(mtime),
-                "relative_dir": str(path.parent.relative_to(cfg.codex_home)),
+                "relative_dir": relative_dir,
             }
         )
     return rows
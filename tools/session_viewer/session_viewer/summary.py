@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import html
 import json
-from textwrap import shorten
-from typing import Optional
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple
 
 from markdown import markdown
 
@@ -30,13 +32,27 @@ EVENT_ICON_MAP = {
 }
 
 
+# Every known icon class is built once here, so cards share these strings instead of
+# formatting a fresh one each.
+_ICON_CLASS_BY_NAME = {
+    name: f"icon icon-{name}" for name in {*EVENT_ICON_MAP.values(), *ROLE_ICONS.values(), "message-square"}
+}
+_ICON_CLASS_BY_KEY = {key: _ICON_CLASS_BY_NAME[name] for key, name in EVENT_ICON_MAP.items()}
+
+
+# Event types whose generic fallback card is hidden in the timeline.
+HIDDEN_EVENT_TYPES = frozenset({"turn_context", "response_item"})
+
+
 def _icon_class_for_name(icon_name: str) -> str:
-    return f"icon icon-{icon_name}"
+    icon_class = _ICON_CLASS_BY_NAME.get(icon_name)
+    if icon_class is None:
+        icon_class = f"icon icon-{icon_name}"
+    return icon_class
 
 
 def _icon_class(key: str, fallback: str = "info") -> str:
-    icon_name = EVENT_ICON_MAP.get(key, fallback)
-    return _icon_class_for_name(icon_name)
+    return _ICON_CLASS_BY_KEY.get(key) or _icon_class_for_name(fallback)
 
 
 def _truncate_text(value: Optional[str], *, width: int = 600) -> Optional[str]:
@@ -45,172 +61,228 @@ def _truncate_text(value: Optional[str], *, width: int = 600) -> Optional[str]:
     single = value.strip()
     if len(single) <= width:
         return single
-    return shorten(single, width=width, placeholder="…")
+    # Cut at the last word boundary that fits instead of re-wrapping the whole string.
+    return single[: width - 1].rsplit(" ", 1)[0] + "…"
+
+
+# Anything Markdown could act on: inline/block syntax, raw HTML or entities, blank lines,
+# indentation, trailing spaces (hard breaks), ordered-list markers, tabs and CRs.
+_MARKDOWN_SYNTAX = re.compile(r"[`*_#>\[\]|\-+=<&!\\~\t\r]|\n[ \t]*\n|^[ \t]|[ \t]$|^\d+[.)]", re.MULTILINE)
+
+
+@lru_cache(maxsize=1024)
+def _render_markdown_cached(value: str) -> str:
+    text = value.strip("\n")
+    if not _MARKDOWN_SYNTAX.search(text):
+        # Plain prose renders to a single paragraph; skip the Python-Markdown pipeline.
+        return f"<p>{html.escape(text, quote=False)}</p>"
+    return markdown(value, extensions=["fenced_code", "tables", "sane_lists"], output_format="html5")
 
 
 def _render_markdown(value: Optional[str]) -> Optional[str]:
     if not value:
         return None
-    return markdown(value, extensions=["fenced_code", "tables", "sane_lists"], output_format="html5")
+    return _render_markdown_cached(value)
 
 
-def to_card(event: RawEvent, delta: Optional[float]) -> Optional[TimelineCard]:
-    payload = event.payload
-    if event.type == "response_item":
-        item_type = payload.get("type")
-        if item_type == "message":
-            role = payload.get("role", "assistant")
-            text_chunks = []
-            for part in payload.get("content", []):
-                if part.get("type") == "input_text":
-                    text_chunks.append(part.get("text", ""))
-                elif part.get("type") == "output_text":
-                    text_chunks.append(part.get("text", ""))
-            text = "\n".join(text_chunks).strip()
-            icon_class = _icon_class_for_name(ROLE_ICONS.get(role, "message-square"))
-            title = f"{role.title()} message"
-            presentation = "hidden" if role == "user" else "summary-collapsed"
-            return TimelineCard(
-                timestamp=event.timestamp,
-                delta_seconds=delta,
-                kind="message",
-                title=title,
-                body=text,
-                body_html=_render_markdown(text),
-                icon="",
-                icon_class=icon_class,
-                presentation=presentation,
-                raw=event.raw,
-            )
-        if item_type == "tool_result":
-            tool_name = payload.get("tool_name", "tool")
-            output_chunks = []
-            for part in payload.get("content", []):
-                if part.get("type") == "output_text":
-                    output_chunks.append(part.get("text", ""))
-            return TimelineCard(
-                timestamp=event.timestamp,
-                delta_seconds=delta,
-                kind="tool",
-                title=f"Tool result: {tool_name}",
-                body=_truncate_text("\n".join(output_chunks), width=800),
-                icon="",
-                icon_class=_icon_class("tool"),
-                presentation="summary-collapsed",
-                raw=event.raw,
-            )
-    if event.type == "event_msg":
-        msg_type = payload.get("type")
-        if msg_type == "user_message":
-            markdown_body = _render_markdown(payload.get("message"))
-            return TimelineCard(
-                timestamp=event.timestamp,
-                delta_seconds=delta,
-                kind="user_event",
-                title="User Command",
-                body=payload.get("message"),
-                body_html=markdown_body,
-                icon="",
-                icon_class=_icon_class("user_event"),
-                presentation="full",
-                raw=event.raw,
-            )
-        if msg_type == "agent_message":
-            markdown_body = _render_markdown(payload.get("message"))
-            return TimelineCard(
-                timestamp=event.timestamp,
-                delta_seconds=delta,
-                kind="assistant_event",
-                title="Assistant",
-                body=payload.get("message"),
-                body_html=markdown_body,
-                icon="",
-                icon_class=_icon_class("assistant_event"),
-                presentation="full",
-                raw=event.raw,
-            )
-        if msg_type == "agent_reasoning":
-            markdown_body = _render_markdown(payload.get("text"))
-            return TimelineCard(
-                timestamp=event.timestamp,
-                delta_seconds=delta,
-                kind="reasoning",
-                title="Agent reasoning",
-                body=payload.get("text"),
-                body_html=markdown_body,
-                icon="",
-                icon_class=_icon_class("reasoning"),
-                presentation="summary-collapsed",
-                raw=event.raw,
-            )
-        if msg_type == "thinking":
-            return TimelineCard(
-                timestamp=event.timestamp,
-                delta_seconds=delta,
-                kind="thinking",
-                title="Agent reasoning",
-                body=_truncate_text(payload.get("text")),
-                icon="",
-                icon_class=_icon_class("thinking"),
-                presentation="summary-collapsed",
-                raw=event.raw,
-            )
-        if msg_type == "token_count":
-            info = payload.get("info") or {}
-            total = info.get("total_token_usage") or {}
-            text = f"Input {total.get('input_tokens')}, Output {total.get('output_tokens')}"
-            return TimelineCard(
-                timestamp=event.timestamp,
-                delta_seconds=delta,
-                kind="tokens",
-                title="Token usage",
-                body=text,
-                icon="",
-                icon_class=_icon_class("tokens"),
-                presentation="hidden",
-                raw=event.raw,
-            )
-    if event.type == "thinking":
-        return TimelineCard(
-            timestamp=event.timestamp,
-            delta_seconds=delta,
-            kind="thinking",
-            title="Agent reasoning",
-            body=_truncate_text(payload.get("text")),
-            icon="",
-            icon_class=_icon_class("thinking"),
-            presentation="summary-collapsed",
-            raw=event.raw,
-        )
-    if event.type == "exec":
-        command = payload.get("command")
-        stdout = payload.get("stdout") or payload.get("output")
-        stderr = payload.get("stderr")
-        code = []
-        if stdout:
-            code.append(stdout.strip())
-        if stderr:
-            code.append("STDERR:\n" + stderr.strip())
-        return TimelineCard(
-            timestamp=event.timestamp,
-            delta_seconds=delta,
-            kind="exec",
-            title=f"Shell command: {command}",
-            code="\n\n".join(code) if code else None,
-            icon="",
-            icon_class=_icon_class("exec"),
-            presentation="summary-open",
-            raw=event.raw,
-        )
-    presentation = "hidden" if event.type in {"turn_context", "response_item"} else "summary-collapsed"
+_MESSAGE_TEXT_TYPES = frozenset({"input_text", "output_text"})
+
+
+def _extract_message_text(payload: dict) -> str:
+    chunks = []
+    append = chunks.append
+    for part in payload.get("content", []):
+        if part.get("type") in _MESSAGE_TEXT_TYPES:
+            append(part.get("text", ""))
+    return "\n".join(chunks).strip()
+
+
+def _message_card(event: RawEvent, delta: Optional[float], payload: dict) -> TimelineCard:
+    role = payload.get("role", "assistant")
+    text = _extract_message_text(payload)
+    icon_class = _icon_class_for_name(ROLE_ICONS.get(role, "message-square"))
+    title = f"{role.title()} message"
+    presentation = "hidden" if role == "user" else "summary-collapsed"
+    return TimelineCard(
+        timestamp=event.timestamp,
+        delta_seconds=delta,
+        kind="message",
+        title=title,
+        body=text,
+        body_markdown=text,
+        icon="",
+        icon_class=icon_class,
+        presentation=presentation,
+        raw=event.raw,
+    )
+
+
+def _tool_result_card(event: RawEvent, delta: Optional[float], payload: dict) -> TimelineCard:
+    tool_name = payload.get("tool_name", "tool")
+    output_chunks = []
+    for part in payload.get("content", []):
+        if part.get("type") == "output_text":
+            output_chunks.append(part.get("text", ""))
+    return TimelineCard(
+        timestamp=event.timestamp,
+        delta_seconds=delta,
+        kind="tool",
+        title=f"Tool result: {tool_name}",
+        body=_truncate_text("\n".join(output_chunks), width=800),
+        icon="",
+        icon_class=_icon_class("tool"),
+        presentation="summary-collapsed",
+        raw=event.raw,
+    )
+
+
+def _user_message_card(event: RawEvent, delta: Optional[float], payload: dict) -> TimelineCard:
+    return TimelineCard(
+        timestamp=event.timestamp,
+        delta_seconds=delta,
+        kind="user_event",
+        title="User Command",
+        body=payload.get("message"),
+        body_markdown=payload.get("message"),
+        icon="",
+        icon_class=_icon_class("user_event"),
+        presentation="full",
+        raw=event.raw,
+    )
+
+
+def _agent_message_card(event: RawEvent, delta: Optional[float], payload: dict) -> TimelineCard:
+    return TimelineCard(
+        timestamp=event.timestamp,
+        delta_seconds=delta,
+        kind="assistant_event",
+        title="Assistant",
+        body=payload.get("message"),
+        body_markdown=payload.get("message"),
+        icon="",
+        icon_class=_icon_class("assistant_event"),
+        presentation="full",
+        raw=event.raw,
+    )
+
+
+def _agent_reasoning_card(event: RawEvent, delta: Optional[float], payload: dict) -> TimelineCard:
+    return TimelineCard(
+        timestamp=event.timestamp,
+        delta_seconds=delta,
+        kind="reasoning",
+        title="Agent reasoning",
+        body=payload.get("text"),
+        body_markdown=payload.get("text"),
+        icon="",
+        icon_class=_icon_class("reasoning"),
+        presentation="summary-collapsed",
+        raw=event.raw,
+    )
+
+
+def _thinking_card(event: RawEvent, delta: Optional[float], payload: dict) -> TimelineCard:
+    return TimelineCard(
+        timestamp=event.timestamp,
+        delta_seconds=delta,
+        kind="thinking",
+        title="Agent reasoning",
+        body=_truncate_text(payload.get("text")),
+        icon="",
+        icon_class=_icon_class("thinking"),
+        presentation="summary-collapsed",
+        raw=event.raw,
+    )
+
+
+def _token_count_card(event: RawEvent, delta: Optional[float], payload: dict) -> TimelineCard:
+    info = payload.get("info") or {}
+    total = info.get("total_token_usage") or {}
+    text = f"Input {total.get('input_tokens')}, Output {total.get('output_tokens')}"
+    return TimelineCard(
+        timestamp=event.timestamp,
+        delta_seconds=delta,
+        kind="tokens",
+        title="Token usage",
+        body=text,
+        icon="",
+        icon_class=_icon_class("tokens"),
+        presentation="hidden",
+        raw=event.raw,
+    )
+
+
+def _exec_card(event: RawEvent, delta: Optional[float], payload: dict) -> TimelineCard:
+    command = payload.get("command")
+    stdout = payload.get("stdout") or payload.get("output")
+    stderr = payload.get("stderr")
+    code = []
+    if stdout:
+        code.append(stdout.strip())
+    if stderr:
+        code.append("STDERR:\n" + stderr.strip())
+    return TimelineCard(
+        timestamp=event.timestamp,
+        delta_seconds=delta,
+        kind="exec",
+        title=f"Shell command: {command}",
+        code="\n\n".join(code) if code else None,
+        icon="",
+        icon_class=_icon_class("exec"),
+        presentation="summary-open",
+        raw=event.raw,
+    )
+
+
+def _generic_card(event: RawEvent, delta: Optional[float], payload: dict) -> TimelineCard:
+    presentation = "hidden" if event.type in HIDDEN_EVENT_TYPES else "summary-collapsed"
     return TimelineCard(
         timestamp=event.timestamp,
         delta_seconds=delta,
         kind=event.type,
         title=f"Event: {event.type}",
-        body=_truncate_text(json.dumps(event.payload, ensure_ascii=False, indent=2), width=1200),
+        body=_truncate_text(json.dumps(payload, ensure_ascii=False, indent=2), width=1200),
         icon="",
         icon_class=_icon_class("event"),
         presentation=presentation,
         raw=event.raw,
     )
+
+
+CardBuilder = Callable[[RawEvent, Optional[float], dict], TimelineCard]
+
+# (event.type, payload["type"]) -> builder; a None payload type matches any payload of that
+# event type. Anything unmatched gets the generic card.
+_CARD_BUILDERS: Dict[Tuple[str, Optional[str]], CardBuilder] = {
+    ("response_item", "message"): _message_card,
+    ("response_item", "tool_result"): _tool_result_card,
+    ("event_msg", "user_message"): _user_message_card,
+    ("event_msg", "agent_message"): _agent_message_card,
+    ("event_msg", "agent_reasoning"): _agent_reasoning_card,
+    ("event_msg", "thinking"): _thinking_card,
+    ("event_msg", "token_count"): _token_count_card,
+    ("thinking", None): _thinking_card,
+    ("exec", None): _exec_card,
+}
+
+
+def to_card(event: RawEvent, delta: Optional[float], *, include_hidden: bool = True) -> Optional[TimelineCard]:
+    """Build the timeline card for an event.
+
+    With include_hidden=False, cards the timeline would hide are dropped (None), and the
+    generic ones are skipped before their payload is serialized.
+    """
+    payload = event.payload
+    payload_type = payload.get("type")
+    # Only string payload types are keyed; a list or dict "type" would not even hash.
+    builder = (
+        (isinstance(payload_type, str) and _CARD_BUILDERS.get((event.type, payload_type)))
+        or _CARD_BUILDERS.get((event.type, None))
+        or _generic_card
+    )
+    if not include_hidden and builder is _generic_card and event.type in HIDDEN_EVENT_TYPES:
+        return None
+    card = builder(event, delta, payload)
+    if not include_hidden and card.presentation == "hidden":
+        return None
+    return card